@@ -1,26 +1,66 @@
 """Performance metrics collection and monitoring utilities."""
 
 import asyncio
+import json
 import threading
 import time
-from collections import defaultdict, deque
+import types
+from array import array
+from collections import defaultdict
+from contextlib import ExitStack
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import psutil
 
-
-@dataclass
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bound once so the hot record path skips the attribute lookup on ``time``
+_now = time.time
+# Monotonic, high-resolution clock for durations
+_perf_counter_ns = time.perf_counter_ns
+# Shared read-only tags for untagged metrics, avoiding a new dict per record
+_EMPTY_TAGS: Mapping[str, str] = types.MappingProxyType({})
+
+# Percentiles reported by get_histogram_stats, as (key, quantile)
+_PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p95", 0.95), ("p99", 0.99))
+# Below this size sorted() beats the cost of building a numpy array
+_NUMPY_MIN_VALUES = 32
+# Only the most recent values are kept per histogram
+_HISTOGRAM_MAX_VALUES = 1000
+# Number of per-name lock stripes; must be a power of two
+_LOCK_STRIPES = 16
+
+
+@dataclass(slots=True, frozen=True)
 class PerformanceMetric:
     """Individual performance metric."""
 
     name: str
     value: float
     timestamp: float
-    tags: Dict[str, str] = field(default_factory=dict)
+    tags: Mapping[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SystemStats:
     """System performance statistics."""
 
@@ -35,19 +75,215 @@ class SystemStats:
     timestamp: float
 
 
+def _histogram_stats(values: Sequence[float]) -> Dict[str, float]:
+    """Summarise histogram values as count, min, max, mean and percentiles."""
+    if not values:
+        return {}
+
+    count = len(values)
+    if np is not None and count >= _NUMPY_MIN_VALUES:
+        # Partition around the percentile ranks instead of a full sort
+        arr = np.array(values, dtype=np.float64)
+        indices = [int(count * q) for _, q in _PERCENTILES]
+        partitioned = np.partition(arr, indices)
+        stats = {
+            "count": count,
+            "min": float(arr.min()),
+            "max": float(arr.max()),
+            "mean": float(arr.mean()),
+        }
+        for (key, _), index in zip(_PERCENTILES, indices):
+            stats[key] = float(partitioned[index])
+        return stats
+
+    sorted_values = sorted(values)
+
+    return {
+        "count": count,
+        "min": sorted_values[0],
+        "max": sorted_values[-1],
+        "mean": sum(sorted_values) / count,
+        "p50": sorted_values[int(count * 0.5)],
+        "p90": sorted_values[int(count * 0.9)],
+        "p95": sorted_values[int(count * 0.95)],
+        "p99": sorted_values[int(count * 0.99)],
+    }
+
+
+class _MetricRing:
+    """Fixed-capacity ring of raw metrics stored column-wise.
+
+    The columns are preallocated, so recording a metric allocates nothing;
+    ``PerformanceMetric`` objects are only built when the ring is read.
+    Exposes the read side of a ``deque(maxlen=...)``. Not thread-safe.
+    """
+
+    __slots__ = (
+        "maxlen",
+        "_names",
+        "_values",
+        "_timestamps",
+        "_tags",
+        "_pos",
+        "_count",
+    )
+
+    def __init__(self, maxlen: int):
+        if maxlen < 0:
+            raise ValueError("maxlen must be non-negative")
+        self.maxlen = maxlen
+        self._names: List[Optional[str]] = [None] * maxlen
+        self._values = array("d", bytes(8 * maxlen))
+        self._timestamps = array("d", bytes(8 * maxlen))
+        self._tags: List[Optional[Mapping[str, str]]] = [None] * maxlen
+        self._pos = 0
+        self._count = 0
+
+    def push(
+        self, name: str, value: float, timestamp: float, tags: Mapping[str, str]
+    ) -> None:
+        """Store a metric, overwriting the oldest one when full."""
+        if not self.maxlen:
+            # Like deque(maxlen=0): accept and keep nothing
+            return
+        pos = self._pos
+        self._names[pos] = name
+        self._values[pos] = value
+        self._timestamps[pos] = timestamp
+        self._tags[pos] = tags
+        pos += 1
+        self._pos = 0 if pos == self.maxlen else pos
+        if self._count < self.maxlen:
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> PerformanceMetric:
+        count = self._count
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("metric index out of range")
+        slot = (self._pos - count + index) % self.maxlen
+        return PerformanceMetric(
+            self._names[slot],
+            self._values[slot],
+            self._timestamps[slot],
+            self._tags[slot],
+        )
+
+    def __iter__(self) -> Iterator[PerformanceMetric]:
+        for index in range(self._count):
+            yield self[index]
+
+    def recent(self, limit: int) -> List[PerformanceMetric]:
+        """Return up to ``limit`` of the newest metrics, oldest first."""
+        count = self._count
+        return [self[index] for index in range(max(count - limit, 0), count)]
+
+    def clear(self) -> None:
+        """Drop all stored metrics."""
+        self._names = [None] * self.maxlen
+        self._tags = [None] * self.maxlen
+        self._pos = 0
+        self._count = 0
+
+
+class _HistogramRing:
+    """Fixed-capacity ring of histogram values backed by ``array('d')``.
+
+    Values are stored as raw doubles rather than float objects, and only the
+    newest ``maxlen`` are kept. Not thread-safe.
+    """
+
+    __slots__ = ("maxlen", "_buf", "_pos", "_count")
+
+    def __init__(self, maxlen: int = _HISTOGRAM_MAX_VALUES):
+        self.maxlen = maxlen
+        self._buf = array("d", bytes(8 * maxlen))
+        self._pos = 0
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        """Add a value, overwriting the oldest one when full."""
+        pos = self._pos
+        self._buf[pos] = value
+        pos += 1
+        self._pos = 0 if pos == self.maxlen else pos
+        if self._count < self.maxlen:
+            self._count += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Add many values using at most two slice copies."""
+        new = array("d", values)
+        maxlen = self.maxlen
+        if len(new) >= maxlen:
+            self._buf[:] = new[-maxlen:]
+            self._pos = 0
+            self._count = maxlen
+            return
+
+        pos = self._pos
+        first = min(len(new), maxlen - pos)
+        self._buf[pos : pos + first] = new[:first]
+        rest = len(new) - first
+        if rest:
+            self._buf[:rest] = new[first:]
+        self._pos = (pos + len(new)) % maxlen
+        self._count = min(self._count + len(new), maxlen)
+
+    def values(self) -> array:
+        """Return a copy of the stored values, oldest first."""
+        if self._count < self.maxlen:
+            return self._buf[: self._count]
+        return self._buf[self._pos :] + self._buf[: self._pos]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> float:
+        count = self._count
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("histogram index out of range")
+        return self._buf[(self._pos - count + index) % self.maxlen]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values())
+
+
 class MetricsCollector:
     """Centralized metrics collection system."""
 
-    def __init__(self, max_metrics: int = 10000):
-        self._metrics: deque = deque(maxlen=max_metrics)
+    def __init__(
+        self,
+        max_metrics: int = 10000,
+        system_stats_ttl: float = 1.0,
+        record_raw: bool = True,
+        dedup_gauges: bool = True,
+    ):
+        self._metrics = _MetricRing(max_metrics)
+        # When False, counters, gauges and histograms only update their
+        # aggregates and skip the raw metric stream
+        self._record_raw = record_raw
+        # When True, setting a gauge to its current value records nothing
+        self._dedup_gauges = dedup_gauges
         self._counters: Dict[str, int] = defaultdict(int)
         self._gauges: Dict[str, float] = {}
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
+        self._histograms: Dict[str, _HistogramRing] = defaultdict(_HistogramRing)
         self._system_stats: List[SystemStats] = []
+        # _lock guards the raw metric ring and system stats; counters, gauges
+        # and histograms are guarded by a lock stripe chosen by metric name
         self._lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
         self._process = psutil.Process()
         self._last_disk_io = None
         self._last_network_io = None
+        # Snapshot reused for calls within the TTL to avoid repeated psutil reads
+        self._sys_cache: Optional[Tuple[float, SystemStats]] = None
+        self._sys_ttl = system_stats_ttl
         self._collection_interval = 60  # seconds
         self._collection_task: Optional[asyncio.Task] = None
 
@@ -81,7 +317,11 @@ class MetricsCollector:
                 pass
 
     def _get_system_stats(self) -> SystemStats:
-        """Get current system statistics."""
+        """Get current system statistics, cached for ``system_stats_ttl`` seconds."""
+        now = time.monotonic()
+        if self._sys_cache and now - self._sys_cache[0] < self._sys_ttl:
+            return self._sys_cache[1]
+
         # CPU and memory
         cpu_percent = psutil.cpu_percent()
         memory = psutil.virtual_memory()
@@ -112,7 +352,7 @@ class MetricsCollector:
 
         self._last_network_io = network_io
 
-        return SystemStats(
+        stats = SystemStats(
             cpu_percent=cpu_percent,
             memory_percent=memory.percent,
             memory_used_mb=memory.used / (1024 * 1024),
@@ -123,80 +363,128 @@ class MetricsCollector:
             network_bytes_recv=network_recv,
             timestamp=time.time(),
         )
+        self._sys_cache = (now, stats)
+        return stats
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        """Return the lock stripe guarding the aggregate for ``name``."""
+        return self._locks[hash(name) & (_LOCK_STRIPES - 1)]
 
     def record_metric(
         self, name: str, value: float, tags: Optional[Dict[str, str]] = None
     ) -> None:
         """Record a performance metric."""
-        metric = PerformanceMetric(
-            name=name, value=value, timestamp=time.time(), tags=tags or {}
-        )
+        timestamp = _now()
 
         with self._lock:
-            self._metrics.append(metric)
+            self._metrics.push(name, value, timestamp, tags or _EMPTY_TAGS)
 
     def increment_counter(
         self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None
     ) -> None:
         """Increment a counter metric."""
-        with self._lock:
+        with self._lock_for(name):
             self._counters[name] += value
-        self.record_metric(f"{name}_total", self._counters[name], tags)
+            total = self._counters[name]
+        if self._record_raw:
+            self.record_metric(f"{name}_total", total, tags)
 
     def set_gauge(
         self, name: str, value: float, tags: Optional[Dict[str, str]] = None
     ) -> None:
         """Set a gauge metric."""
-        with self._lock:
+        with self._lock_for(name):
+            if self._dedup_gauges and self._gauges.get(name) == value:
+                return
             self._gauges[name] = value
-        self.record_metric(name, value, tags)
+        if self._record_raw:
+            self.record_metric(name, value, tags)
 
     def record_histogram(
         self, name: str, value: float, tags: Optional[Dict[str, str]] = None
     ) -> None:
         """Record a histogram value."""
-        with self._lock:
+        with self._lock_for(name):
             self._histograms[name].append(value)
-            # Keep only last 1000 values per histogram
-            if len(self._histograms[name]) > 1000:
-                self._histograms[name] = self._histograms[name][-1000:]
 
-        self.record_metric(name, value, tags)
+        if self._record_raw:
+            self.record_metric(name, value, tags)
 
-    def get_histogram_stats(self, name: str) -> Dict[str, float]:
-        """Get statistics for a histogram."""
-        with self._lock:
-            values = self._histograms.get(name, [])
+    def record_histogram_batch(
+        self,
+        name: str,
+        values: Iterable[float],
+        tags: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Record many histogram values at once.
 
+        Equivalent to calling ``record_histogram`` for each value, but takes
+        each lock once and extends the histogram in a single call, so loops
+        like ``for v in values: record_histogram(name, v)`` can be replaced.
+        """
+        values = list(values)
         if not values:
-            return {}
+            return
 
-        sorted_values = sorted(values)
-        count = len(sorted_values)
+        with self._lock_for(name):
+            self._histograms[name].extend(values)
 
-        return {
-            "count": count,
-            "min": sorted_values[0],
-            "max": sorted_values[-1],
-            "mean": sum(sorted_values) / count,
-            "p50": sorted_values[int(count * 0.5)],
-            "p90": sorted_values[int(count * 0.9)],
-            "p95": sorted_values[int(count * 0.95)],
-            "p99": sorted_values[int(count * 0.99)],
-        }
+        if self._record_raw:
+            tags = tags or _EMPTY_TAGS
+            timestamp = _now()
+            with self._lock:
+                push = self._metrics.push
+                for value in values:
+                    push(name, value, timestamp, tags)
+
+    def _record_timer(
+        self,
+        name: str,
+        duration: float,
+        tags: Optional[Dict[str, str]] = None,
+        error: bool = False,
+    ) -> None:
+        """Record a timer's duration histogram and success/error counter."""
+        histogram_name = f"{name}_duration_seconds"
+        counter_name = f"{name}_error_total" if error else f"{name}_success_total"
+        tags = tags or _EMPTY_TAGS
+        timestamp = _now()
+
+        # Locks are taken one at a time so two stripes are never held together
+        with self._lock_for(histogram_name):
+            self._histograms[histogram_name].append(duration)
+
+        with self._lock_for(counter_name):
+            self._counters[counter_name] += 1
+            total = self._counters[counter_name]
+
+        if self._record_raw:
+            with self._lock:
+                self._metrics.push(histogram_name, duration, timestamp, tags)
+                self._metrics.push(f"{counter_name}_total", total, timestamp, tags)
+
+    def get_histogram_stats(self, name: str) -> Dict[str, float]:
+        """Get statistics for a histogram."""
+        with self._lock_for(name):
+            histogram = self._histograms.get(name)
+            values = histogram.values() if histogram is not None else ()
+
+        return _histogram_stats(values)
 
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get a summary of all collected metrics."""
         with self._lock:
-            recent_metrics = list(self._metrics)[-100:]  # Last 100 metrics
+            recent_metrics = self._metrics.recent(100)  # Last 100 metrics
+            # Single dict copies, so no stripe is needed for a consistent view
             counters = dict(self._counters)
             gauges = dict(self._gauges)
             system_stats = self._system_stats[-10:] if self._system_stats else []
+            histogram_names = list(self._histograms)
 
-        # Calculate histogram summaries
-        histogram_summaries = {}
-        for name in self._histograms:
-            histogram_summaries[name] = self.get_histogram_stats(name)
+        # Each histogram is copied under its own stripe and summarised outside it
+        histogram_summaries = {
+            name: self.get_histogram_stats(name) for name in histogram_names
+        }
 
         return {
             "recent_metrics": [
@@ -204,7 +492,7 @@ class MetricsCollector:
                     "name": m.name,
                     "value": m.value,
                     "timestamp": m.timestamp,
-                    "tags": m.tags,
+                    "tags": dict(m.tags),
                 }
                 for m in recent_metrics
             ],
@@ -233,9 +521,19 @@ class MetricsCollector:
             },
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize the metrics summary to compact JSON bytes."""
+        summary = self.get_metrics_summary()
+        if orjson is not None:
+            return orjson.dumps(summary)
+        return json.dumps(summary, separators=(",", ":")).encode()
+
     def clear_metrics(self) -> None:
         """Clear all collected metrics."""
-        with self._lock:
+        with ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock)
+            stack.enter_context(self._lock)
             self._metrics.clear()
             self._counters.clear()
             self._gauges.clear()
@@ -254,86 +552,106 @@ class PerformanceTimer:
     ):
         self.collector = metrics_collector
         self.metric_name = metric_name
-        self.tags = tags or {}
-        self.start_time = 0.0
+        self.tags = tags or _EMPTY_TAGS
+        self._start_ns = 0
 
     def __enter__(self):
-        self.start_time = time.time()
+        self._start_ns = _perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
-        self.collector.record_histogram(
-            f"{self.metric_name}_duration_seconds", duration, self.tags
+        duration = (_perf_counter_ns() - self._start_ns) * 1e-9
+        # Duration histogram plus success/error counter in one collector call;
+        # each is updated under its own lock stripe, one lock at a time
+        self.collector._record_timer(
+            self.metric_name, duration, self.tags, exc_type is not None
         )
 
-        # Also record success/error
-        if exc_type is None:
-            self.collector.increment_counter(
-                f"{self.metric_name}_success_total", tags=self.tags
-            )
-        else:
-            self.collector.increment_counter(
-                f"{self.metric_name}_error_total", tags=self.tags
-            )
-
 
-# Global metrics collector instance
-_global_collector: Optional[MetricsCollector] = None
+# Global metrics collector instance, created once at import so lookups
+# never pay for a lazy-initialisation check
+_global_collector = MetricsCollector()
 
 
 def get_global_collector() -> MetricsCollector:
-    """Get or create the global metrics collector."""
-    global _global_collector
-    if _global_collector is None:
-        _global_collector = MetricsCollector()
+    """Get the global metrics collector."""
     return _global_collector
 
 
 def start_global_collection() -> None:
     """Start global metrics collection."""
-    collector = get_global_collector()
-    collector.start_collection()
+    _global_collector.start_collection()
 
 
 def stop_global_collection() -> None:
     """Stop global metrics collection."""
-    global _global_collector
-    if _global_collector:
-        _global_collector.stop_collection()
+    _global_collector.stop_collection()
+
+
+# The convenience functions below bind the global collector as a default
+# argument, so it is resolved once at definition time rather than per call.
 
 
 def record_metric(
-    name: str, value: float, tags: Optional[Dict[str, str]] = None
+    name: str,
+    value: float,
+    tags: Optional[Dict[str, str]] = None,
+    *,
+    _collector: MetricsCollector = _global_collector,
 ) -> None:
     """Record a metric using the global collector."""
-    collector = get_global_collector()
-    collector.record_metric(name, value, tags)
+    _collector.record_metric(name, value, tags)
 
 
 def increment_counter(
-    name: str, value: int = 1, tags: Optional[Dict[str, str]] = None
+    name: str,
+    value: int = 1,
+    tags: Optional[Dict[str, str]] = None,
+    *,
+    _collector: MetricsCollector = _global_collector,
 ) -> None:
     """Increment a counter using the global collector."""
-    collector = get_global_collector()
-    collector.increment_counter(name, value, tags)
+    _collector.increment_counter(name, value, tags)
 
 
-def set_gauge(name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+def set_gauge(
+    name: str,
+    value: float,
+    tags: Optional[Dict[str, str]] = None,
+    *,
+    _collector: MetricsCollector = _global_collector,
+) -> None:
     """Set a gauge using the global collector."""
-    collector = get_global_collector()
-    collector.set_gauge(name, value, tags)
+    _collector.set_gauge(name, value, tags)
 
 
 def record_histogram(
-    name: str, value: float, tags: Optional[Dict[str, str]] = None
+    name: str,
+    value: float,
+    tags: Optional[Dict[str, str]] = None,
+    *,
+    _collector: MetricsCollector = _global_collector,
 ) -> None:
     """Record a histogram value using the global collector."""
-    collector = get_global_collector()
-    collector.record_histogram(name, value, tags)
+    _collector.record_histogram(name, value, tags)
+
+
+def record_histogram_batch(
+    name: str,
+    values: Iterable[float],
+    tags: Optional[Dict[str, str]] = None,
+    *,
+    _collector: MetricsCollector = _global_collector,
+) -> None:
+    """Record many histogram values using the global collector."""
+    _collector.record_histogram_batch(name, values, tags)
 
 
-def timer(metric_name: str, tags: Optional[Dict[str, str]] = None) -> PerformanceTimer:
+def timer(
+    metric_name: str,
+    tags: Optional[Dict[str, str]] = None,
+    *,
+    _collector: MetricsCollector = _global_collector,
+) -> PerformanceTimer:
     """Create a performance timer using the global collector."""
-    collector = get_global_collector()
-    return PerformanceTimer(collector, metric_name, tags)
+    return PerformanceTimer(_collector, metric_name, tags)
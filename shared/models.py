@@ -1,9 +1,19 @@
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
+
+# Simple range and length checks are declared as constraints so pydantic-core
+# enforces them without calling back into Python validators.
+HostStr = Annotated[str, StringConstraints(min_length=1, strip_whitespace=True)]
+PortNumber = Annotated[int, Field(ge=1, le=65535)]
+FileSizeLimit = Annotated[int, Field(gt=0, le=10 * 1024 * 1024 * 1024)]  # 10GB
+ClientName = Annotated[
+    str, StringConstraints(min_length=1, max_length=50, strip_whitespace=True)
+]
+ApiKey = Annotated[str, StringConstraints(min_length=8, max_length=256)]
 
 
 class SyncOperation(str, Enum):
@@ -14,6 +24,8 @@ class SyncOperation(str, Enum):
 
 
 class FileInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     path: str
     size: int = Field(ge=0)  # Size must be >= 0
     checksum: str
@@ -46,8 +58,8 @@ class SyncRequest(BaseModel):
 class SyncResponse(BaseModel):
     success: bool
     message: str
-    files_to_sync: List[FileInfo] = []
-    conflicts: List[str] = []
+    files_to_sync: List[FileInfo] = Field(default_factory=list)
+    conflicts: List[str] = Field(default_factory=list)
 
 
 class ConflictResolution(BaseModel):
@@ -57,26 +69,12 @@ class ConflictResolution(BaseModel):
 
 
 class ServerConfig(BaseModel):
-    host: str = "localhost"
-    port: int = 8000
+    host: HostStr = "localhost"
+    port: PortNumber = 8000
     sync_directory: str = "./sync_data"
-    max_file_size: int = 100 * 1024 * 1024  # 100MB
+    max_file_size: FileSizeLimit = 100 * 1024 * 1024  # 100MB
     allowed_extensions: Optional[List[str]] = None
 
-    @field_validator("host")
-    @classmethod
-    def validate_host(cls, v):
-        if not v or not v.strip():
-            raise ValueError("Host cannot be empty")
-        return v.strip()
-
-    @field_validator("port")
-    @classmethod
-    def validate_port(cls, v):
-        if not 1 <= v <= 65535:
-            raise ValueError("Port must be between 1 and 65535")
-        return v
-
     @field_validator("sync_directory")
     @classmethod
     def validate_sync_directory(cls, v):
@@ -101,15 +99,6 @@ class ServerConfig(BaseModel):
 
         return str(path.absolute())
 
-    @field_validator("max_file_size")
-    @classmethod
-    def validate_max_file_size(cls, v):
-        if v <= 0:
-            raise ValueError("Max file size must be positive")
-        if v > 10 * 1024 * 1024 * 1024:  # 10GB
-            raise ValueError("Max file size too large (max 10GB)")
-        return v
-
     @field_validator("allowed_extensions")
     @classmethod
     def validate_allowed_extensions(cls, v):
@@ -121,33 +110,16 @@ class ServerConfig(BaseModel):
 
 
 class ClientConfig(BaseModel):
-    server_host: str = "localhost"
-    server_port: int = 8000
-    client_name: str
+    server_host: HostStr = "localhost"
+    server_port: PortNumber = 8000
+    client_name: ClientName
     sync_directory: str
     ignore_patterns: List[str] = [".git", "__pycache__", "*.tmp"]
-    api_key: Optional[str] = None
-
-    @field_validator("server_host")
-    @classmethod
-    def validate_server_host(cls, v):
-        if not v or not v.strip():
-            raise ValueError("Server host cannot be empty")
-        return v.strip()
-
-    @field_validator("server_port")
-    @classmethod
-    def validate_server_port(cls, v):
-        if not 1 <= v <= 65535:
-            raise ValueError("Server port must be between 1 and 65535")
-        return v
+    api_key: Optional[ApiKey] = None
 
     @field_validator("client_name")
     @classmethod
     def validate_client_name(cls, v):
-        if not v or not v.strip():
-            raise ValueError("Client name cannot be empty")
-
         # Check for invalid characters
         invalid_chars = '<>:"/\\|?*'
         if any(char in v for char in invalid_chars):
@@ -155,10 +127,7 @@ class ClientConfig(BaseModel):
                 f"Client name contains invalid characters: {invalid_chars}"
             )
 
-        if len(v.strip()) > 50:
-            raise ValueError("Client name too long (max 50 characters)")
-
-        return v.strip()
+        return v
 
     @field_validator("sync_directory")
     @classmethod
@@ -197,13 +166,3 @@ class ClientConfig(BaseModel):
                 raise ValueError("Ignore patterns cannot be empty")
 
         return v
-
-    @field_validator("api_key")
-    @classmethod
-    def validate_api_key(cls, v):
-        if v is not None:
-            if len(v) < 8:
-                raise ValueError("API key too short (minimum 8 characters)")
-            if len(v) > 256:
-                raise ValueError("API key too long (maximum 256 characters)")
-        return v
@@ -1,52 +1,197 @@
 import asyncio
+import errno
 import fnmatch
+import functools
 import hashlib
+import itertools
+import multiprocessing
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor
+import shutil
+import stat
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Pattern, Union
-
-import aiofiles
+from typing import (
+    Awaitable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Largest readinto buffer used for fast checksums; smaller files get one sized
+# to fit
+_HASH_READ_SIZE = 1024 * 1024
+# Files above this size are dropped from the page cache once hashed
+_FADVISE_DONTNEED_THRESHOLD = 64 * 1024 * 1024
+
+# Bytes moved per copy_file_range/sendfile call when copying in kernel space
+_KERNEL_COPY_BLOCK = 64 * 1024 * 1024
+# Errors meaning "this kernel copy method is unavailable here", not a real failure
+_KERNEL_COPY_FALLBACK_ERRNOS = frozenset(
+    code
+    for code in (
+        getattr(errno, name, None)
+        for name in ("ENOSYS", "EXDEV", "EINVAL", "EOPNOTSUPP", "ENOTSUP", "ENOTSOCK")
+    )
+    if code is not None
+)
+
+# Shared pool for blocking filesystem calls, created on first use
+_io_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool used for blocking filesystem work."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4),
+            thread_name_prefix="syncer-io",
+        )
+    return _io_executor
+
+
+# With use_processes, fast-checksum batches at least this large are hashed in
+# worker processes
+_PROCESS_POOL_MIN_BATCH = 16
+# Files per worker-process job when a batch is hashed in processes
+_PROCESS_HASH_CHUNK = 8
+# Paths per stat call in batch_get_file_info; hashing of one chunk overlaps
+# the stat of the next
+_STAT_CHUNK = 64
+# In-flight checksums per unit of batch_get_file_info's max_workers
+_IN_FLIGHT_PER_WORKER = 16
+
+# Process pool for CPU-bound hashing, created on first use
+_hash_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_hash_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool used for batch hashing."""
+    global _hash_process_pool
+    if _hash_process_pool is None:
+        # fork is unsafe once the event loop and I/O threads are running
+        methods = multiprocessing.get_all_start_methods()
+        start_method = "forkserver" if "forkserver" in methods else "spawn"
+        _hash_process_pool = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context(start_method)
+        )
+    return _hash_process_pool
+
+
+def _discard_hash_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken process pool so the next batch starts a fresh one."""
+    global _hash_process_pool
+    if _hash_process_pool is pool:
+        _hash_process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """Pass an access-pattern hint to the kernel where posix_fadvise exists."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        # Only a hint; some filesystems reject it
+        pass
 
 
 async def calculate_file_checksum(file_path: str, chunk_size: int = 65536) -> str:
-    """Calculate SHA-256 checksum of a file asynchronously with larger chunks."""
-    sha256_hash = hashlib.sha256()
+    """Calculate SHA-256 checksum of a file asynchronously in a worker thread."""
+    # One thread hop for the whole file instead of one aiofiles hop per chunk
+    return await asyncio.to_thread(calculate_file_checksum_sync, file_path, chunk_size)
+
+
+def _hash_file_into(hasher, file_path: str, buffer_size: int = _HASH_READ_SIZE):
+    """Feed a whole file to ``hasher`` with readinto over one buffer.
+
+    Files being edited are hashed all the time; unlike an mmap, a read sees a
+    concurrent truncation as a short read instead of a SIGBUS.
+    """
+    total = 0
+    with open(file_path, "rb", buffering=0) as f:
+        # Most files are small; zero-filling a full-size buffer for them
+        # costs more than hashing them
+        buffer = bytearray(min(os.fstat(f.fileno()).st_size + 1, buffer_size))
+        # Widen read-ahead; the file is read once, front to back
+        _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+        with memoryview(buffer) as view:
+            while size := f.readinto(buffer):
+                hasher.update(view[:size])
+                total += size
+        if total > _FADVISE_DONTNEED_THRESHOLD:
+            # Keep one huge file from evicting the rest of the page cache
+            _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+    return hasher
+
+
+def calculate_file_checksum_sync(file_path: str, chunk_size: int = 65536) -> str:
+    """Calculate SHA-256 checksum of a file synchronously."""
     try:
-        async with aiofiles.open(file_path, "rb") as f:
-            while chunk := await f.read(chunk_size):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+        return _hash_file_into(hashlib.sha256(), file_path, chunk_size).hexdigest()
     except OSError:
         return ""
 
 
-def calculate_file_checksum_sync(file_path: str, chunk_size: int = 65536) -> str:
-    """Calculate SHA-256 checksum of a file synchronously with larger chunks."""
-    sha256_hash = hashlib.sha256()
+def _hash_file_worker(file_path: str) -> str:
+    """Compute the fast checksum of one file; runs inside a worker process."""
     try:
-        file_obj = Path(file_path)
-        with file_obj.open("rb") as f:
-            while chunk := f.read(chunk_size):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+        import xxhash
+    except ImportError:
+        return calculate_file_checksum_sync(file_path)
+
+    try:
+        return _hash_file_into(xxhash.xxh3_64(), file_path).hexdigest()
     except OSError:
         return ""
 
 
+def _hash_files_worker(file_paths: List[str]) -> List[str]:
+    """Compute the fast checksums of several files; runs inside a worker process."""
+    return [_hash_file_worker(file_path) for file_path in file_paths]
+
+
+async def _hash_files_in_process_pool(file_paths: List[str]) -> List[str]:
+    """Fast-checksum files in the process pool, in-process if the pool broke."""
+    loop = asyncio.get_running_loop()
+    pool = _get_hash_process_pool()
+    try:
+        return await loop.run_in_executor(pool, _hash_files_worker, file_paths)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); later batches get a new pool
+        _discard_hash_process_pool(pool)
+        return await loop.run_in_executor(
+            _get_io_executor(), _hash_files_worker, file_paths
+        )
+
+
 async def calculate_file_checksum_fast(file_path: str) -> str:
-    """Calculate file checksum using xxhash for better performance."""
+    """Calculate file checksum using xxhash (XXH3) for better performance."""
     try:
         # Try to use xxhash if available, fallback to SHA-256
         try:
             import xxhash
 
-            hasher = xxhash.xxh64()
-            async with aiofiles.open(file_path, "rb") as f:
-                while chunk := await f.read(65536):
-                    hasher.update(chunk)
+            hasher = await asyncio.to_thread(
+                _hash_file_into, xxhash.xxh3_64(), file_path
+            )
             return hasher.hexdigest()
         except ImportError:
             return await calculate_file_checksum(file_path)
@@ -59,98 +204,233 @@ async def get_file_info(
 ) -> Optional[Dict[str, Union[str, int, datetime, bool]]]:
     """Get file information including size, modified time, and checksum asynchronously."""
     try:
-        path = Path(file_path)
-        if not path.exists():
-            return None
-
-        stat = path.stat()
-
-        # Calculate checksum asynchronously
-        if path.is_dir():
-            checksum = ""
-        elif fast_checksum:
-            checksum = await calculate_file_checksum_fast(file_path)
-        else:
-            checksum = await calculate_file_checksum(file_path)
-
-        return {
-            "path": str(path),
-            "size": stat.st_size,
-            "modified_time": datetime.fromtimestamp(stat.st_mtime),
-            "is_directory": path.is_dir(),
-            "checksum": checksum,
-        }
+        st = os.stat(file_path)
     except OSError:
         return None
 
+    # Calculate checksum asynchronously
+    is_directory = stat.S_ISDIR(st.st_mode)
+    if is_directory:
+        checksum = ""
+    elif fast_checksum:
+        checksum = await calculate_file_checksum_fast(file_path)
+    else:
+        checksum = await calculate_file_checksum(file_path)
+
+    return {
+        "path": str(Path(file_path)),
+        "size": st.st_size,
+        "modified_time": datetime.fromtimestamp(st.st_mtime),
+        "is_directory": is_directory,
+        "checksum": checksum,
+    }
+
 
 def get_file_info_sync(
     file_path: str,
 ) -> Optional[Dict[str, Union[str, int, datetime, bool]]]:
     """Get file information synchronously (for backward compatibility)."""
     try:
-        path = Path(file_path)
-        if not path.exists():
-            return None
-
-        stat = path.stat()
-        return {
-            "path": str(path),
-            "size": stat.st_size,
-            "modified_time": datetime.fromtimestamp(stat.st_mtime),
-            "is_directory": path.is_dir(),
-            "checksum": ""
-            if path.is_dir()
-            else calculate_file_checksum_sync(file_path),
-        }
+        st = os.stat(file_path)
     except OSError:
         return None
 
+    # Decide on the mode bits from the one stat; directories never hit the hasher
+    is_directory = stat.S_ISDIR(st.st_mode)
+    return {
+        "path": str(Path(file_path)),
+        "size": st.st_size,
+        "modified_time": datetime.fromtimestamp(st.st_mtime),
+        "is_directory": is_directory,
+        "checksum": "" if is_directory else calculate_file_checksum_sync(file_path),
+    }
+
 
 # Keep original function for backward compatibility
 # get_file_info = get_file_info_sync  # Commented out to avoid redefinition
 
 
-# Global cache for compiled patterns
-_compiled_patterns_cache: Dict[str, Pattern[str]] = {}
-
-
+# Compiled patterns are cached in bounded LRU caches so long-running processes
+# that see many distinct patterns do not grow without limit
+@functools.lru_cache(maxsize=2048)
 def _compile_pattern(pattern: str) -> Pattern[str]:
     """Compile fnmatch pattern to regex, with caching."""
-    if pattern not in _compiled_patterns_cache:
-        # Convert fnmatch pattern to regex
-        regex_pattern = fnmatch.translate(pattern)
-        _compiled_patterns_cache[pattern] = re.compile(regex_pattern)
-    return _compiled_patterns_cache[pattern]
+    return re.compile(fnmatch.translate(pattern))
+
+
+# Characters that make an fnmatch pattern a wildcard rather than a literal name
+_GLOB_CHARS = frozenset("*?[")
+# Separators os.path.basename splits on, as a regex character class body
+_SEP_CHARS = re.escape(os.sep + (os.altsep or ""))
+# Below this many glob patterns the combined regex beats a hyperscan scan
+_HYPERSCAN_MIN_PATTERNS = 16
+
+
+def _stop_scan(*_args) -> bool:
+    """Hyperscan match callback that ends the scan at the first match."""
+    return True
+
+
+class _HyperscanGlobs:
+    """fnmatch patterns compiled into one hyperscan database.
+
+    Every pattern is matched in a single pass over the path instead of one
+    regex alternative at a time. Scratch space cannot be shared between
+    concurrent scans, so each thread allocates its own.
+    """
+
+    __slots__ = ("_db", "_local")
+
+    def __init__(self, patterns: List[str]):
+        # fnmatch output is "(?s:BODY)\Z"; atomic groups only speed up Python's
+        # backtracking, so plain groups match the same paths
+        expressions = [
+            f"^(?:{fnmatch.translate(p)[4:-3].replace('(?>', '(?:')})\\z".encode()
+            for p in patterns
+        ]
+        flags = (
+            hyperscan.HS_FLAG_DOTALL
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_SINGLEMATCH
+            | hyperscan.HS_FLAG_ALLOWEMPTY
+        )
+        self._db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self._db.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flags] * len(expressions),
+        )
+        self._local = threading.local()
+
+    def _scan(self, data: bytes) -> bool:
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._db)
+        try:
+            self._db.scan(data, match_event_handler=_stop_scan, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+
+    def match(self, file_path: str) -> bool:
+        """Return whether the basename or the full path matches any pattern.
+
+        Raises UnicodeEncodeError for paths that are not valid UTF-8.
+        """
+        data = file_path.encode()
+        return self._scan(os.path.basename(data)) or self._scan(data)
+
+
+@functools.lru_cache(maxsize=128)
+def _prepare_patterns(
+    patterns: Tuple[str, ...],
+) -> Tuple[FrozenSet[str], Optional[Pattern[str]], Optional[_HyperscanGlobs]]:
+    """Split fnmatch patterns into literal names and the compiled globs.
+
+    Patterns without wildcards only ever match equal strings, so they are kept
+    in a set. The rest are compiled into a single regex whose optional prefix
+    skips to the start of the basename, so one match call tries the basename
+    first and then the full path. Large glob sets are also compiled for
+    hyperscan when it is installed. Results are cached.
+    """
+    literals = frozenset(p for p in patterns if not _GLOB_CHARS.intersection(p))
+    globs = [p for p in patterns if p not in literals]
+    if not globs:
+        return literals, None, None
+
+    alternatives = "|".join(f"(?:{_compile_pattern(p).pattern})" for p in globs)
+    glob_regex = re.compile(
+        f"(?:(?s:.*)[{_SEP_CHARS}](?=[^{_SEP_CHARS}]*\\Z))?(?:{alternatives})"
+    )
+
+    glob_scanner = None
+    if hyperscan is not None and len(globs) >= _HYPERSCAN_MIN_PATTERNS:
+        try:
+            glob_scanner = _HyperscanGlobs(globs)
+        except hyperscan.error:
+            # Syntax hyperscan cannot compile; the regex covers these patterns
+            pass
+    return literals, glob_regex, glob_scanner
 
 
 def should_ignore_file(file_path: str, ignore_patterns: List[str]) -> bool:
-    """Check if a file should be ignored based on patterns (optimized with compiled regex)."""
-    file_name = os.path.basename(file_path)
-    relative_path = file_path
+    """Check if a file should be ignored based on patterns."""
+    if not ignore_patterns:
+        return False
+
+    literals, glob_regex, glob_scanner = _prepare_patterns(tuple(ignore_patterns))
+    if literals and (file_path in literals or os.path.basename(file_path) in literals):
+        return True
+    if glob_scanner is not None:
+        try:
+            return glob_scanner.match(file_path)
+        except UnicodeEncodeError:
+            # Undecodable names (surrogate escapes) are left to the regex
+            pass
+    return glob_regex is not None and glob_regex.match(file_path) is not None
 
-    for pattern in ignore_patterns:
-        compiled_pattern = _compile_pattern(pattern)
-        if compiled_pattern.match(file_name) or compiled_pattern.match(relative_path):
-            return True
-    return False
+
+# Anything pathlib would rewrite: empty or doubled separators, "." components,
+# a trailing slash, or a drive letter (DOTALL so names containing "\n" match too)
+_NEEDS_PATHLIB = re.compile(
+    r"\A\Z|//|(?:\A|/)\.(?:/|\Z)|(?<=.)/\Z|\A[A-Za-z]:", re.DOTALL
+)
 
 
 def normalize_path(path: str) -> str:
     """Normalize file path for cross-platform compatibility."""
     # Replace backslashes with forward slashes for cross-platform compatibility
     normalized = path.replace("\\", "/")
+    # Most paths are already clean; only build a Path for the ones that are not
+    if _NEEDS_PATHLIB.search(normalized) is None:
+        return normalized
     return str(Path(normalized).as_posix())
 
 
+def _copy_file_range(in_fd: int, out_fd: int) -> int:
+    """Copy the next block between file descriptors with copy_file_range."""
+    return os.copy_file_range(in_fd, out_fd, _KERNEL_COPY_BLOCK)
+
+
+def _sendfile(in_fd: int, out_fd: int) -> int:
+    """Copy the next block between file descriptors with sendfile."""
+    return os.sendfile(out_fd, in_fd, None, _KERNEL_COPY_BLOCK)
+
+
+# Kernel-space copy methods available on this platform, in order of preference
+_KERNEL_COPY_FUNCS = tuple(
+    func
+    for name, func in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile))
+    if hasattr(os, name)
+)
+
+
+def _copy_file_kernel(src: str, dst: str, chunk_size: int) -> None:
+    """Copy src to dst in kernel space, falling back to a buffered copy."""
+    with open(src, "rb", buffering=0) as src_file, open(dst, "wb") as dst_file:
+        in_fd, out_fd = src_file.fileno(), dst_file.fileno()
+        for kernel_copy in _KERNEL_COPY_FUNCS:
+            try:
+                while kernel_copy(in_fd, out_fd):
+                    pass
+                return
+            except OSError as e:
+                # Both calls advance the file offsets, so the next method
+                # resumes where this one stopped
+                if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                    raise
+        shutil.copyfileobj(src_file, dst_file, chunk_size)
+
+
 async def copy_file_async(src: str, dst: str, chunk_size: int = 65536) -> None:
-    """Copy file asynchronously with better performance."""
+    """Copy file asynchronously, moving bytes in kernel space where supported."""
     ensure_directory(str(Path(dst).parent))
 
-    async with aiofiles.open(src, "rb") as src_file:
-        async with aiofiles.open(dst, "wb") as dst_file:
-            while chunk := await src_file.read(chunk_size):
-                await dst_file.write(chunk)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        _get_io_executor(), _copy_file_kernel, src, dst, chunk_size
+    )
 
 
 def ensure_directory(directory: str) -> None:
@@ -160,33 +440,187 @@ def ensure_directory(directory: str) -> None:
 
 async def ensure_directory_async(directory: str) -> None:
     """Ensure directory exists asynchronously."""
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        await loop.run_in_executor(executor, ensure_directory, directory)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_get_io_executor(), ensure_directory, directory)
 
 
 def get_relative_path(file_path: str, base_path: str) -> str:
     """Get relative path from base directory."""
+    if (
+        os.sep == "/"
+        and _NEEDS_PATHLIB.search(file_path) is None
+        and _NEEDS_PATHLIB.search(base_path) is None
+    ):
+        # Clean POSIX paths compare component-wise as plain strings
+        if file_path == base_path:
+            return "."
+        prefix = base_path if base_path == "/" else base_path + "/"
+        if file_path.startswith(prefix):
+            return file_path[len(prefix) :]
+        return file_path
+
     try:
         return str(Path(file_path).relative_to(Path(base_path)))
     except ValueError:
         return file_path
 
 
+def _stat_paths(file_paths: List[str]) -> List[Optional[os.stat_result]]:
+    """Stat every path in one pass, using None for paths that cannot be read."""
+    results: List[Optional[os.stat_result]] = []
+    for file_path in file_paths:
+        try:
+            results.append(os.stat(file_path))
+        except OSError:
+            results.append(None)
+    return results
+
+
+class FileInfoBatch:
+    """File information for a batch of paths, stored column-wise.
+
+    Sizes and modification times live in ``array`` columns, so scans over a
+    batch touch contiguous memory and can be handed to numpy without a copy
+    (``np.frombuffer(batch.sizes, dtype=np.int64)``). Indexing or iterating
+    builds the same dict ``get_file_info`` returns, or None for paths that
+    could not be read; slicing returns a list of those rows.
+    """
+
+    __slots__ = ("paths", "sizes", "mtimes", "exists", "is_directory", "checksums")
+
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+        self.sizes = array("q")
+        self.mtimes = array("d")
+        self.exists = bytearray()
+        self.is_directory = bytearray()
+        self.checksums: List[str] = []
+
+    def append(
+        self, file_path: str, st: Optional[os.stat_result], checksum: str = ""
+    ) -> None:
+        """Add one entry; ``st`` is None for a path that could not be read."""
+        self.paths.append(file_path)
+        if st is None:
+            self.sizes.append(0)
+            self.mtimes.append(0.0)
+            self.exists.append(0)
+            self.is_directory.append(0)
+        else:
+            self.sizes.append(st.st_size)
+            self.mtimes.append(st.st_mtime)
+            self.exists.append(1)
+            self.is_directory.append(stat.S_ISDIR(st.st_mode))
+        self.checksums.append(checksum)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.paths)))]
+        if not self.exists[index]:
+            return None
+        return {
+            "path": self.paths[index],
+            "size": self.sizes[index],
+            "modified_time": datetime.fromtimestamp(self.mtimes[index]),
+            "is_directory": bool(self.is_directory[index]),
+            "checksum": self.checksums[index],
+        }
+
+    def __iter__(
+        self,
+    ) -> Iterator[Optional[Dict[str, Union[str, int, datetime, bool]]]]:
+        for index in range(len(self.paths)):
+            yield self[index]
+
+
 async def batch_get_file_info(
-    file_paths: List[str], max_workers: int = 4, fast_checksum: bool = False
+    file_paths: List[str],
+    max_workers: int = 4,
+    fast_checksum: bool = False,
+    use_processes: bool = False,
 ) -> List[Optional[Dict[str, Union[str, int, datetime, bool]]]]:
     """Get file information for multiple files concurrently."""
-    semaphore = asyncio.Semaphore(max_workers)
-
-    async def get_file_info_with_semaphore(
-        file_path: str,
-    ) -> Optional[Dict[str, Union[str, int, datetime, bool]]]:
+    return list(
+        await batch_get_file_info_columns(
+            file_paths,
+            max_workers=max_workers,
+            fast_checksum=fast_checksum,
+            use_processes=use_processes,
+        )
+    )
+
+
+async def batch_get_file_info_columns(
+    file_paths: List[str],
+    max_workers: int = 4,
+    fast_checksum: bool = False,
+    use_processes: bool = False,
+) -> FileInfoBatch:
+    """Get file information for multiple files concurrently, column-wise.
+
+    ``use_processes`` hashes large fast-checksum batches in a forkserver/spawn
+    process pool. Those workers re-import ``__main__``, so only enable it from
+    programs whose entry point is guarded by ``if __name__ == "__main__"``.
+    """
+    loop = asyncio.get_running_loop()
+    # All stat chunks are queued up front, so hashing of the first chunk starts
+    # while later ones are still being stat'd
+    stat_chunks = [
+        loop.run_in_executor(
+            _get_io_executor(), _stat_paths, file_paths[i : i + _STAT_CHUNK]
+        )
+        for i in range(0, len(file_paths), _STAT_CHUNK)
+    ]
+
+    # Large batches scale across cores; small ones are not worth the IPC
+    use_processes = (
+        use_processes and fast_checksum and len(file_paths) >= _PROCESS_POOL_MIN_BATCH
+    )
+    checksum_func = (
+        calculate_file_checksum_fast if fast_checksum else calculate_file_checksum
+    )
+    semaphore = asyncio.Semaphore(max_workers * _IN_FLIGHT_PER_WORKER)
+
+    async def checksum_with_semaphore(file_path: str) -> str:
         async with semaphore:
-            return await get_file_info_async(file_path, fast_checksum)
-
-    tasks = [get_file_info_with_semaphore(file_path) for file_path in file_paths]
-    return await asyncio.gather(*tasks, return_exceptions=False)
+            return await checksum_func(file_path)
+
+    stats: List[Optional[os.stat_result]] = []
+    # Awaitables yielding lists of checksums, in path order
+    hash_jobs: List[Awaitable[List[str]]] = []
+    for stat_chunk in stat_chunks:
+        chunk_stats = await stat_chunk
+        # Only regular files need a checksum
+        to_hash = [
+            path
+            for path, st in zip(file_paths[len(stats) :], chunk_stats)
+            if st is not None and not stat.S_ISDIR(st.st_mode)
+        ]
+        stats.extend(chunk_stats)
+
+        if use_processes:
+            hash_jobs.extend(
+                asyncio.ensure_future(
+                    _hash_files_in_process_pool(to_hash[i : i + _PROCESS_HASH_CHUNK])
+                )
+                for i in range(0, len(to_hash), _PROCESS_HASH_CHUNK)
+            )
+        else:
+            hash_jobs.append(
+                asyncio.gather(*(checksum_with_semaphore(path) for path in to_hash))
+            )
+    checksums = itertools.chain.from_iterable(await asyncio.gather(*hash_jobs))
+
+    batch = FileInfoBatch()
+    for file_path, st in zip(file_paths, stats):
+        if st is None or stat.S_ISDIR(st.st_mode):
+            batch.append(str(Path(file_path)), st)
+        else:
+            batch.append(str(Path(file_path)), st, next(checksums))
+    return batch
 
 
 # Rename async version to avoid confusion
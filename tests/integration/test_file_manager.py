@@ -111,8 +111,9 @@ class TestFileManagerIntegration:
         assert retrieved.is_directory is False
 
         # Update metadata
-        file_info.size = 2048
-        file_info.checksum = "new_checksum"
+        file_info = file_info.model_copy(
+            update={"size": 2048, "checksum": "new_checksum"}
+        )
         await file_manager.update_file_metadata(file_info)
 
         # Retrieve updated metadata
@@ -1,6 +1,7 @@
 """Unit tests for metrics collection utilities."""
 
 import asyncio
+import json
 import time
 from unittest.mock import Mock, patch
 
@@ -11,9 +12,11 @@ from shared.metrics import (
     PerformanceMetric,
     PerformanceTimer,
     SystemStats,
+    _HistogramRing,
     get_global_collector,
     increment_counter,
     record_histogram,
+    record_histogram_batch,
     record_metric,
     set_gauge,
     timer,
@@ -95,6 +98,42 @@ class TestMetricsCollector:
         collector = MetricsCollector(max_metrics=5000)
         assert collector._metrics.maxlen == 5000
 
+    def test_metrics_buffer_evicts_oldest(self):
+        """Test the raw metric buffer keeps only the newest max_metrics entries."""
+        collector = MetricsCollector(max_metrics=3)
+
+        for i in range(5):
+            collector.record_metric(f"metric_{i}", float(i))
+
+        assert len(collector._metrics) == 3
+        assert [m.name for m in collector._metrics] == [
+            "metric_2",
+            "metric_3",
+            "metric_4",
+        ]
+        assert collector._metrics[0].value == 2.0
+        assert collector._metrics[-1].value == 4.0
+        assert [m.name for m in collector._metrics.recent(2)] == [
+            "metric_3",
+            "metric_4",
+        ]
+
+    def test_metrics_buffer_zero_capacity(self):
+        """Test max_metrics=0 keeps no raw metrics, like deque(maxlen=0)."""
+        collector = MetricsCollector(max_metrics=0)
+
+        collector.record_metric("metric", 1.0)
+        collector.increment_counter("counter")
+        collector.record_histogram("histogram", 2.0)
+
+        assert len(collector._metrics) == 0
+        assert list(collector._metrics) == []
+        assert collector.get_histogram_stats("histogram")["count"] == 1
+        assert collector.get_metrics_summary() is not None
+
+        with pytest.raises(ValueError):
+            MetricsCollector(max_metrics=-1)
+
     def test_record_metric(self):
         """Test recording a metric."""
         collector = MetricsCollector()
@@ -108,6 +147,19 @@ class TestMetricsCollector:
         assert metric.tags["tag"] == "value"
         assert isinstance(metric.timestamp, float)
 
+    def test_record_metric_without_tags(self):
+        """Test untagged metrics share one read-only empty tags mapping."""
+        collector = MetricsCollector()
+
+        collector.record_metric("first", 1.0)
+        collector.record_metric("second", 2.0)
+
+        first, second = collector._metrics
+        assert first.tags == {}
+        assert first.tags is second.tags
+        with pytest.raises(TypeError):
+            first.tags["tag"] = "value"
+
     def test_increment_counter(self):
         """Test incrementing a counter."""
         collector = MetricsCollector()
@@ -137,6 +189,21 @@ class TestMetricsCollector:
         # Should record metrics
         assert len(collector._metrics) >= 2
 
+    def test_set_gauge_unchanged_value(self):
+        """Test repeated gauge values are deduplicated unless disabled."""
+        collector = MetricsCollector()
+
+        collector.set_gauge("connections", 5)
+        collector.set_gauge("connections", 5)
+        assert collector._gauges["connections"] == 5
+        assert len(collector._metrics) == 1
+
+        collector = MetricsCollector(dedup_gauges=False)
+
+        collector.set_gauge("connections", 5)
+        collector.set_gauge("connections", 5)
+        assert len(collector._metrics) == 2
+
     def test_record_histogram(self):
         """Test recording histogram values."""
         collector = MetricsCollector()
@@ -146,11 +213,56 @@ class TestMetricsCollector:
             collector.record_histogram("response_time", value)
 
         assert len(collector._histograms["response_time"]) == 5
-        assert collector._histograms["response_time"] == values
+        assert list(collector._histograms["response_time"]) == values
 
         # Should record metrics
         assert len(collector._metrics) == 5
 
+    def test_record_histogram_batch(self):
+        """Test recording histogram values in bulk."""
+        collector = MetricsCollector()
+
+        collector.record_histogram_batch("response_time", [1.0, 2.0, 3.0])
+        collector.record_histogram_batch("response_time", iter([4.0, 5.0]))
+        collector.record_histogram_batch("response_time", [])
+
+        assert list(collector._histograms["response_time"]) == [
+            1.0,
+            2.0,
+            3.0,
+            4.0,
+            5.0,
+        ]
+        assert [m.value for m in collector._metrics] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    def test_record_histogram_batch_size_limit(self):
+        """Test bulk histogram recording keeps only the most recent values."""
+        collector = MetricsCollector()
+
+        collector.record_histogram_batch("large_histogram", range(1200))
+
+        histogram_values = collector._histograms["large_histogram"]
+        assert len(histogram_values) == 1000
+        assert histogram_values[0] == 200
+        assert histogram_values[-1] == 1199
+
+    def test_histogram_ring_wraparound(self):
+        """Test the histogram ring keeps the newest values in order."""
+        ring = _HistogramRing(maxlen=4)
+
+        ring.extend([1.0, 2.0])
+        ring.extend([3.0, 4.0, 5.0])  # wraps past the end of the buffer
+        assert list(ring) == [2.0, 3.0, 4.0, 5.0]
+
+        ring.append(6.0)
+        assert list(ring) == [3.0, 4.0, 5.0, 6.0]
+        assert ring[0] == 3.0
+        assert ring[-1] == 6.0
+        assert len(ring) == 4
+
+        ring.extend(range(10))
+        assert list(ring.values()) == [6.0, 7.0, 8.0, 9.0]
+
     def test_get_histogram_stats(self):
         """Test histogram statistics calculation."""
         collector = MetricsCollector()
@@ -171,6 +283,26 @@ class TestMetricsCollector:
         assert "p95" in stats
         assert "p99" in stats
 
+    def test_get_histogram_stats_large(self):
+        """Test histogram statistics on a histogram large enough to partition."""
+        collector = MetricsCollector()
+
+        values = [float((i * 37) % 500) for i in range(500)]
+        for value in values:
+            collector.record_histogram("large", value)
+
+        stats = collector.get_histogram_stats("large")
+        sorted_values = sorted(values)
+
+        assert stats["count"] == 500
+        assert stats["min"] == sorted_values[0]
+        assert stats["max"] == sorted_values[-1]
+        assert stats["mean"] == pytest.approx(sum(values) / 500)
+        assert stats["p50"] == sorted_values[250]
+        assert stats["p90"] == sorted_values[450]
+        assert stats["p95"] == sorted_values[475]
+        assert stats["p99"] == sorted_values[495]
+
     def test_get_histogram_stats_empty(self):
         """Test histogram statistics for non-existent histogram."""
         collector = MetricsCollector()
@@ -200,6 +332,44 @@ class TestMetricsCollector:
         assert summary["gauges"]["active_users"] == 100
         assert "latency" in summary["histograms"]
 
+    def test_record_raw_disabled(self):
+        """Test aggregates are kept without raw metrics when record_raw is off."""
+        collector = MetricsCollector(record_raw=False)
+
+        collector.increment_counter("requests", 2)
+        collector.set_gauge("users", 10)
+        collector.record_histogram("latency", 0.5)
+        with PerformanceTimer(collector, "op"):
+            pass
+
+        assert collector._counters["requests"] == 2
+        assert collector._gauges["users"] == 10
+        assert list(collector._histograms["latency"]) == [0.5]
+        assert collector._counters["op_success_total"] == 1
+        assert len(collector._metrics) == 0
+
+        # Explicit raw metrics are still recorded
+        collector.record_metric("explicit", 1.0)
+        assert len(collector._metrics) == 1
+
+    def test_to_json_bytes(self):
+        """Test serializing the metrics summary to JSON bytes."""
+        collector = MetricsCollector()
+        collector.increment_counter("requests", 3)
+        collector.record_histogram("latency", 0.25, {"route": "/sync"})
+
+        data = collector.to_json_bytes()
+        assert isinstance(data, bytes)
+        assert json.loads(data) == json.loads(
+            json.dumps(collector.get_metrics_summary())
+        )
+
+        # Falls back to the stdlib encoder without orjson
+        with patch("shared.metrics.orjson", None):
+            fallback = json.loads(collector.to_json_bytes())
+        assert fallback["counters"]["requests"] == 3
+        assert fallback["histograms"]["latency"]["count"] == 1
+
     def test_clear_metrics(self):
         """Test clearing all metrics."""
         collector = MetricsCollector()
@@ -255,6 +425,29 @@ class TestMetricsCollector:
         assert stats.memory_available_mb == 4096.0
         assert isinstance(stats.timestamp, float)
 
+    @patch("shared.metrics.psutil")
+    def test_get_system_stats_cached(self, mock_psutil):
+        """Test system statistics are reused within the TTL."""
+        mock_psutil.cpu_percent.return_value = 50.0
+        mock_psutil.virtual_memory.return_value = Mock(
+            percent=60.0, used=1024 * 1024, available=1024 * 1024
+        )
+        mock_psutil.disk_io_counters.return_value = None
+        mock_psutil.net_io_counters.return_value = None
+
+        collector = MetricsCollector(system_stats_ttl=60.0)
+        first = collector._get_system_stats()
+        second = collector._get_system_stats()
+
+        assert first is second
+        assert mock_psutil.cpu_percent.call_count == 1
+
+        # A zero TTL always takes a fresh snapshot
+        collector = MetricsCollector(system_stats_ttl=0.0)
+        collector._get_system_stats()
+        collector._get_system_stats()
+        assert mock_psutil.cpu_percent.call_count == 3
+
     def test_histogram_size_limit(self):
         """Test histogram size limiting."""
         collector = MetricsCollector()
@@ -372,7 +565,16 @@ class TestGlobalFunctions:
 
         record_histogram("global_histogram", 2.5)
 
-        assert collector._histograms["global_histogram"] == [2.5]
+        assert list(collector._histograms["global_histogram"]) == [2.5]
+
+    def test_global_record_histogram_batch(self):
+        """Test global record_histogram_batch function."""
+        collector = get_global_collector()
+        collector.clear_metrics()
+
+        record_histogram_batch("global_histogram", [1.5, 2.5])
+
+        assert list(collector._histograms["global_histogram"]) == [1.5, 2.5]
 
     def test_global_timer(self):
         """Test global timer function."""
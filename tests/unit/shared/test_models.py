@@ -1,9 +1,10 @@
 """Unit tests for shared models."""
 
 import os
-import tempfile
+import re
+import stat
 from datetime import datetime
-from pathlib import Path
+from uuid import uuid4
 
 import pytest
 from pydantic import ValidationError
@@ -20,16 +21,89 @@ from shared.models import (
     SyncResponse,
 )
 
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+EXPECTED_OPERATIONS = frozenset({"create", "update", "delete", "move"})
+
+_FILES = [
+    FileInfo(path=f"file{i}.txt", size=100 * i, checksum=f"hash{i}", modified_time=NOW)
+    for i in (1, 2)
+]
+
+_EMPTY_HOST = re.compile(r"^host\n.*at least 1 character", re.M)
+_PORT_TOO_LOW = re.compile(r"^port\n.*greater than or equal to 1\b", re.M)
+_PORT_TOO_HIGH = re.compile(r"^port\n.*less than or equal to 65535", re.M)
+_NON_POSITIVE_SIZE = re.compile(r"^max_file_size\n.*greater than 0", re.M)
+_SIZE_TOO_LARGE = re.compile(r"^max_file_size\n.*less than or equal to", re.M)
+_NO_DOT_EXTENSION = re.compile("File extension must start with dot")
+_EMPTY_SERVER_HOST = re.compile(r"^server_host\n.*at least 1 character", re.M)
+_BAD_SERVER_PORT = re.compile(r"^server_port\n.*greater than or equal to 1\b", re.M)
+_EMPTY_SYNC_DIR = re.compile("Sync directory cannot be empty")
+_NOT_A_DIR = re.compile("not a directory")
+_EMPTY_CLIENT_NAME = re.compile(r"^client_name\n.*at least 1 character", re.M)
+_INVALID_CHARS = re.compile("invalid characters")
+_NAME_TOO_LONG = re.compile(r"^client_name\n.*at most 50 characters", re.M)
+_NOT_A_LIST = re.compile("Input should be a valid list")
+_EMPTY_PATTERN = re.compile("Ignore patterns cannot be empty")
+_KEY_TOO_SHORT = re.compile(r"^api_key\n.*at least 8 characters", re.M)
+_KEY_TOO_LONG = re.compile(r"^api_key\n.*at most 256 characters", re.M)
+
+INVALID_SERVER_CONFIGS = [
+    ({"host": ""}, _EMPTY_HOST),
+    ({"host": "   "}, _EMPTY_HOST),
+    ({"port": 0}, _PORT_TOO_LOW),
+    ({"port": 65536}, _PORT_TOO_HIGH),
+    ({"max_file_size": -1}, _NON_POSITIVE_SIZE),
+    ({"max_file_size": 0}, _NON_POSITIVE_SIZE),
+    ({"max_file_size": 11 * 1024 * 1024 * 1024}, _SIZE_TOO_LARGE),
+    ({"allowed_extensions": ["txt", ".py"]}, _NO_DOT_EXTENSION),
+]
+
+_CC_VAL = ClientConfig.__pydantic_validator__
+
+INVALID_CLIENT_CONFIGS = [
+    ({"server_host": ""}, _EMPTY_SERVER_HOST),
+    ({"server_port": 0}, _BAD_SERVER_PORT),
+]
+
+
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """Create one temporary directory shared by all model tests."""
+    return tmp_path_factory.mktemp("models")
+
+
+@pytest.fixture
+def sync_dir(shared_tmp):
+    """Return a unique, not yet created path under the shared directory."""
+    return shared_tmp / uuid4().hex
+
+
+@pytest.fixture(scope="session")
+def file_not_dir(tmp_path_factory):
+    """Create one regular file for the "not a directory" checks."""
+    path = tmp_path_factory.mktemp("f") / "afile"
+    path.write_bytes(b"")
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def base_file_info():
+    """Create a canonical FileInfo that tests derive variants from."""
+    return FileInfo(path="test.txt", size=100, checksum="hash", modified_time=NOW)
+
+
+def _assert_is_dir(path):
+    """Assert that path exists and is a directory using a single stat call."""
+    assert stat.S_ISDIR(os.stat(path).st_mode)
+
 
 class TestSyncOperation:
     """Test SyncOperation enum."""
 
     def test_sync_operation_values(self):
         """Test SyncOperation enum values."""
-        assert SyncOperation.CREATE == "create"
-        assert SyncOperation.UPDATE == "update"
-        assert SyncOperation.DELETE == "delete"
-        assert SyncOperation.MOVE == "move"
+        assert {op.value for op in SyncOperation} == EXPECTED_OPERATIONS
 
     def test_sync_operation_membership(self):
         """Test SyncOperation membership."""
@@ -42,29 +116,27 @@ class TestFileInfo:
 
     def test_file_info_creation(self):
         """Test FileInfo creation with valid data."""
-        now = datetime.now()
         file_info = FileInfo(
             path="test/file.txt",
             size=1024,
             checksum="abc123",
-            modified_time=now,
+            modified_time=NOW,
             is_directory=False,
         )
 
         assert file_info.path == "test/file.txt"
         assert file_info.size == 1024
         assert file_info.checksum == "abc123"
-        assert file_info.modified_time == now
+        assert file_info.modified_time == NOW
         assert file_info.is_directory is False
 
     def test_file_info_directory(self):
         """Test FileInfo for directory."""
-        now = datetime.now()
         file_info = FileInfo(
             path="test/directory",
             size=0,
             checksum="",
-            modified_time=now,
+            modified_time=NOW,
             is_directory=True,
         )
 
@@ -75,48 +147,63 @@ class TestFileInfo:
     def test_file_info_default_directory(self):
         """Test FileInfo default is_directory value."""
         file_info = FileInfo(
-            path="test.txt", size=100, checksum="hash", modified_time=datetime.now()
+            path="test.txt", size=100, checksum="hash", modified_time=NOW
         )
 
         assert file_info.is_directory is False
 
+    def test_file_info_is_frozen(self, base_file_info):
+        """Test FileInfo instances are immutable and hashable."""
+        with pytest.raises(ValidationError):
+            base_file_info.size = 2048
+
+        assert hash(base_file_info) == hash(base_file_info.model_copy())
+
     def test_file_info_validation_errors(self):
         """Test FileInfo validation errors."""
-        now = datetime.now()
+        validator = FileInfo.__pydantic_validator__
 
         # Missing required fields
         with pytest.raises(ValidationError):
-            FileInfo()
+            validator.validate_python({})
 
         # Invalid size (negative)
         with pytest.raises(ValidationError):
-            FileInfo(path="test.txt", size=-1, checksum="hash", modified_time=now)
+            validator.validate_python(
+                {
+                    "path": "test.txt",
+                    "size": -1,
+                    "checksum": "hash",
+                    "modified_time": NOW,
+                }
+            )
+
+    def test_file_info_constructor_validation_error(self):
+        """Test FileInfo constructor surfaces validation errors."""
+        with pytest.raises(ValidationError):
+            FileInfo()
 
 
 class TestSyncMessage:
     """Test SyncMessage model."""
 
-    def test_sync_message_creation(self):
+    def test_sync_message_creation(self, base_file_info):
         """Test SyncMessage creation."""
-        file_info = FileInfo(
-            path="test.txt", size=100, checksum="hash", modified_time=datetime.now()
-        )
-
         message = SyncMessage(
-            operation=SyncOperation.CREATE, file_info=file_info, client_id="client123"
+            operation=SyncOperation.CREATE,
+            file_info=base_file_info,
+            client_id="client123",
         )
 
         assert message.operation == SyncOperation.CREATE
-        assert message.file_info == file_info
+        assert message.file_info == base_file_info
         assert message.client_id == "client123"
         assert isinstance(message.timestamp, datetime)
         assert message.old_path is None
 
-    def test_sync_message_with_move(self):
+    def test_sync_message_with_move(self, base_file_info):
         """Test SyncMessage for move operation."""
-        file_info = FileInfo(
-            path="new/path.txt", size=100, checksum="hash", modified_time=datetime.now()
-        )
+        file_info = base_file_info.model_copy(update={"path": "new/path.txt"})
 
         message = SyncMessage(
             operation=SyncOperation.MOVE,
@@ -128,19 +215,18 @@ class TestSyncMessage:
         assert message.operation == SyncOperation.MOVE
         assert message.old_path == "old/path.txt"
 
-    def test_sync_message_default_timestamp(self):
+    def test_sync_message_default_timestamp(self, base_file_info):
         """Test SyncMessage default timestamp."""
-        file_info = FileInfo(
-            path="test.txt", size=100, checksum="hash", modified_time=datetime.now()
-        )
-
+        start = datetime.now()
         message = SyncMessage(
-            operation=SyncOperation.UPDATE, file_info=file_info, client_id="client123"
+            operation=SyncOperation.UPDATE,
+            file_info=base_file_info,
+            client_id="client123",
         )
+        end = datetime.now()
 
-        # Timestamp should be recent
-        time_diff = datetime.now() - message.timestamp
-        assert time_diff.total_seconds() < 1
+        # Timestamp should be taken during construction
+        assert start <= message.timestamp <= end
 
 
 class TestClientInfo:
@@ -148,19 +234,18 @@ class TestClientInfo:
 
     def test_client_info_creation(self):
         """Test ClientInfo creation."""
-        now = datetime.now()
         client_info = ClientInfo(
             client_id="client123",
             name="Test Client",
             sync_root="/home/user/sync",
-            last_seen=now,
+            last_seen=NOW,
             is_online=True,
         )
 
         assert client_info.client_id == "client123"
         assert client_info.name == "Test Client"
         assert client_info.sync_root == "/home/user/sync"
-        assert client_info.last_seen == now
+        assert client_info.last_seen == NOW
         assert client_info.is_online is True
 
     def test_client_info_default_online(self):
@@ -169,7 +254,7 @@ class TestClientInfo:
             client_id="client123",
             name="Test Client",
             sync_root="/home/user/sync",
-            last_seen=datetime.now(),
+            last_seen=NOW,
         )
 
         assert client_info.is_online is True
@@ -180,23 +265,8 @@ class TestSyncRequest:
 
     def test_sync_request_creation(self):
         """Test SyncRequest creation."""
-        files = [
-            FileInfo(
-                path="file1.txt",
-                size=100,
-                checksum="hash1",
-                modified_time=datetime.now(),
-            ),
-            FileInfo(
-                path="file2.txt",
-                size=200,
-                checksum="hash2",
-                modified_time=datetime.now(),
-            ),
-        ]
-
         request = SyncRequest(
-            client_id="client123", files=files, sync_root="/home/user/sync"
+            client_id="client123", files=_FILES, sync_root="/home/user/sync"
         )
 
         assert request.client_id == "client123"
@@ -215,16 +285,9 @@ class TestSyncRequest:
 class TestSyncResponse:
     """Test SyncResponse model."""
 
-    def test_sync_response_creation(self):
+    def test_sync_response_creation(self, base_file_info):
         """Test SyncResponse creation."""
-        files_to_sync = [
-            FileInfo(
-                path="file1.txt",
-                size=100,
-                checksum="hash1",
-                modified_time=datetime.now(),
-            )
-        ]
+        files_to_sync = [base_file_info.model_copy(update={"path": "file1.txt"})]
 
         response = SyncResponse(
             success=True,
@@ -240,12 +303,10 @@ class TestSyncResponse:
 
     def test_sync_response_defaults(self):
         """Test SyncResponse default values."""
-        response = SyncResponse(success=False, message="Error occurred")
+        fields = SyncResponse.model_fields
 
-        assert response.success is False
-        assert response.message == "Error occurred"
-        assert response.files_to_sync == []
-        assert response.conflicts == []
+        assert fields["files_to_sync"].default_factory() == []
+        assert fields["conflicts"].default_factory() == []
 
 
 class TestConflictResolution:
@@ -253,24 +314,21 @@ class TestConflictResolution:
 
     def test_conflict_resolution_creation(self):
         """Test ConflictResolution creation."""
-        now = datetime.now()
         resolution = ConflictResolution(
-            file_path="conflicted.txt", resolution="local", timestamp=now
+            file_path="conflicted.txt", resolution="local", timestamp=NOW
         )
 
         assert resolution.file_path == "conflicted.txt"
         assert resolution.resolution == "local"
-        assert resolution.timestamp == now
+        assert resolution.timestamp == NOW
 
-    def test_conflict_resolution_strategies(self):
+    @pytest.mark.parametrize("strategy", ["local", "remote", "merge"])
+    def test_conflict_resolution_strategies(self, strategy):
         """Test different conflict resolution strategies."""
-        strategies = ["local", "remote", "merge"]
-
-        for strategy in strategies:
-            resolution = ConflictResolution(
-                file_path="test.txt", resolution=strategy, timestamp=datetime.now()
-            )
-            assert resolution.resolution == strategy
+        resolution = ConflictResolution(
+            file_path="test.txt", resolution=strategy, timestamp=NOW
+        )
+        assert resolution.resolution == strategy
 
 
 class TestServerConfig:
@@ -286,221 +344,164 @@ class TestServerConfig:
         assert config.max_file_size == 100 * 1024 * 1024
         assert config.allowed_extensions is None
 
-    def test_server_config_custom_values(self):
+    def test_server_config_custom_values(self, sync_dir):
         """Test ServerConfig with custom values."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            custom_sync_dir = os.path.join(temp_dir, "custom_sync")
-            config = ServerConfig(
-                host="0.0.0.0",
-                port=9000,
-                sync_directory=custom_sync_dir,
-                max_file_size=50 * 1024 * 1024,
-                allowed_extensions=[".txt", ".py"],
-            )
+        custom_sync_dir = str(sync_dir / "custom_sync")
+        config = ServerConfig(
+            host="0.0.0.0",
+            port=9000,
+            sync_directory=custom_sync_dir,
+            max_file_size=50 * 1024 * 1024,
+            allowed_extensions=[".txt", ".py"],
+        )
 
-            assert config.host == "0.0.0.0"
-            assert config.port == 9000
-            assert config.sync_directory == custom_sync_dir
-            assert config.max_file_size == 50 * 1024 * 1024
-            assert config.allowed_extensions == [".txt", ".py"]
-
-    def test_server_config_validation_host(self):
-        """Test ServerConfig host validation."""
-        # Empty host
-        with pytest.raises(ValidationError, match="Host cannot be empty"):
-            ServerConfig(host="")
-
-        # Whitespace only host
-        with pytest.raises(ValidationError, match="Host cannot be empty"):
-            ServerConfig(host="   ")
-
-    def test_server_config_validation_port(self):
-        """Test ServerConfig port validation."""
-        # Port too low
-        with pytest.raises(ValidationError, match="Port must be between 1 and 65535"):
-            ServerConfig(port=0)
-
-        # Port too high
-        with pytest.raises(ValidationError, match="Port must be between 1 and 65535"):
-            ServerConfig(port=65536)
-
-    def test_server_config_validation_sync_directory(self):
+        assert config.host == "0.0.0.0"
+        assert config.port == 9000
+        assert config.sync_directory == custom_sync_dir
+        assert config.max_file_size == 50 * 1024 * 1024
+        assert config.allowed_extensions == [".txt", ".py"]
+
+    def test_server_config_strips_host(self):
+        """Test ServerConfig strips surrounding whitespace from host."""
+        assert ServerConfig(host="  example.com ").host == "example.com"
+
+    @pytest.mark.parametrize("kwargs,msg", INVALID_SERVER_CONFIGS)
+    def test_server_config_invalid(self, kwargs, msg):
+        """Test ServerConfig rejects invalid field values."""
+        with pytest.raises(ValidationError, match=msg):
+            ServerConfig(**kwargs)
+
+    def test_server_config_validation_sync_directory(self, file_not_dir):
         """Test ServerConfig sync directory validation."""
         # Empty directory
-        with pytest.raises(ValidationError, match="Sync directory cannot be empty"):
+        with pytest.raises(ValidationError, match=_EMPTY_SYNC_DIR):
             ServerConfig(sync_directory="")
 
         # Directory exists but is a file
-        with tempfile.NamedTemporaryFile() as temp_file:
-            with pytest.raises(ValidationError, match="not a directory"):
-                ServerConfig(sync_directory=temp_file.name)
-
-    def test_server_config_validation_max_file_size(self):
-        """Test ServerConfig max file size validation."""
-        # Negative size
-        with pytest.raises(ValidationError, match="Max file size must be positive"):
-            ServerConfig(max_file_size=-1)
-
-        # Zero size
-        with pytest.raises(ValidationError, match="Max file size must be positive"):
-            ServerConfig(max_file_size=0)
-
-        # Too large (>10GB)
-        with pytest.raises(ValidationError, match="Max file size too large"):
-            ServerConfig(max_file_size=11 * 1024 * 1024 * 1024)
-
-    def test_server_config_validation_allowed_extensions(self):
-        """Test ServerConfig allowed extensions validation."""
-        # Extension without dot
-        with pytest.raises(ValidationError, match="File extension must start with dot"):
-            ServerConfig(allowed_extensions=["txt", ".py"])
-
-    def test_server_config_directory_creation(self):
+        with pytest.raises(ValidationError, match=_NOT_A_DIR):
+            ServerConfig(sync_directory=file_not_dir)
+
+    def test_server_config_directory_creation(self, sync_dir):
         """Test ServerConfig creates directory if it doesn't exist."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            new_dir = Path(temp_dir) / "new_sync_dir"
+        new_dir = sync_dir / "new_sync_dir"
 
-            config = ServerConfig(sync_directory=str(new_dir))
+        config = ServerConfig(sync_directory=str(new_dir))
 
-            assert Path(config.sync_directory).exists()
-            assert Path(config.sync_directory).is_dir()
+        _assert_is_dir(config.sync_directory)
 
 
 class TestClientConfig:
     """Test ClientConfig model."""
 
-    def test_client_config_creation(self):
+    def test_client_config_creation(self, sync_dir):
         """Test ClientConfig creation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config = ClientConfig(
-                client_name="test_client",
-                sync_directory=temp_dir,
-                server_host="localhost",
-                server_port=8000,
-            )
+        expected = str(sync_dir.absolute())
+        config = ClientConfig(
+            client_name="test_client",
+            sync_directory=str(sync_dir),
+            server_host="localhost",
+            server_port=8000,
+        )
 
-            assert config.client_name == "test_client"
-            assert config.sync_directory == str(Path(temp_dir).absolute())
-            assert config.server_host == "localhost"
-            assert config.server_port == 8000
+        assert config.client_name == "test_client"
+        assert config.sync_directory == expected
+        assert config.server_host == "localhost"
+        assert config.server_port == 8000
 
-    def test_client_config_defaults(self):
+    def test_client_config_defaults(self, sync_dir):
         """Test ClientConfig default values."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config = ClientConfig(client_name="test_client", sync_directory=temp_dir)
-
-            assert config.server_host == "localhost"
-            assert config.server_port == 8000
-            assert config.ignore_patterns == [".git", "__pycache__", "*.tmp"]
-            assert config.api_key is None
-
-    def test_client_config_validation_server_host(self):
-        """Test ClientConfig server host validation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Empty host
-            with pytest.raises(ValidationError, match="Server host cannot be empty"):
-                ClientConfig(
-                    client_name="test", sync_directory=temp_dir, server_host=""
-                )
-
-    def test_client_config_validation_server_port(self):
-        """Test ClientConfig server port validation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Invalid port
-            with pytest.raises(
-                ValidationError, match="Server port must be between 1 and 65535"
-            ):
-                ClientConfig(client_name="test", sync_directory=temp_dir, server_port=0)
-
-    def test_client_config_validation_client_name(self):
-        """Test ClientConfig client name validation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Empty name
-            with pytest.raises(ValidationError, match="Client name cannot be empty"):
-                ClientConfig(client_name="", sync_directory=temp_dir)
-
-            # Name with invalid characters
-            with pytest.raises(ValidationError, match="invalid characters"):
-                ClientConfig(client_name="client<>name", sync_directory=temp_dir)
+        config = ClientConfig(client_name="test_client", sync_directory=str(sync_dir))
+
+        assert config.server_host == "localhost"
+        assert config.server_port == 8000
+        assert config.ignore_patterns == [".git", "__pycache__", "*.tmp"]
+        assert config.api_key is None
+
+    @pytest.mark.parametrize("kwargs,msg", INVALID_CLIENT_CONFIGS)
+    def test_client_config_invalid(self, shared_tmp, kwargs, msg):
+        """Test ClientConfig rejects invalid field values."""
+        with pytest.raises(ValidationError, match=msg):
+            _CC_VAL.validate_python(
+                {"client_name": "test", "sync_directory": str(shared_tmp), **kwargs}
+            )
 
-            # Name too long
-            with pytest.raises(ValidationError, match="Client name too long"):
-                ClientConfig(client_name="x" * 51, sync_directory=temp_dir)
+    @pytest.mark.parametrize(
+        "name,msg",
+        [
+            ("", _EMPTY_CLIENT_NAME),
+            ("client<>name", _INVALID_CHARS),
+            ("x" * 51, _NAME_TOO_LONG),
+        ],
+    )
+    def test_client_config_validation_client_name(self, shared_tmp, name, msg):
+        """Test ClientConfig client name validation."""
+        with pytest.raises(ValidationError, match=msg):
+            _CC_VAL.validate_python(
+                {"client_name": name, "sync_directory": str(shared_tmp)}
+            )
 
-    def test_client_config_validation_sync_directory(self):
+    def test_client_config_validation_sync_directory(self, file_not_dir):
         """Test ClientConfig sync directory validation."""
         # Empty directory
-        with pytest.raises(ValidationError, match="Sync directory cannot be empty"):
+        with pytest.raises(ValidationError, match=_EMPTY_SYNC_DIR):
             ClientConfig(client_name="test", sync_directory="")
 
         # Directory exists but is a file
-        with tempfile.NamedTemporaryFile() as temp_file:
-            with pytest.raises(ValidationError, match="not a directory"):
-                ClientConfig(client_name="test", sync_directory=temp_file.name)
-
-    def test_client_config_validation_ignore_patterns(self):
+        with pytest.raises(ValidationError, match=_NOT_A_DIR):
+            ClientConfig(client_name="test", sync_directory=file_not_dir)
+
+    @pytest.mark.parametrize(
+        "patterns,msg",
+        [
+            ("*.tmp", _NOT_A_LIST),
+            (["*.tmp", ""], _EMPTY_PATTERN),
+        ],
+    )
+    def test_client_config_validation_ignore_patterns(self, shared_tmp, patterns, msg):
         """Test ClientConfig ignore patterns validation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Non-list patterns
-            with pytest.raises(ValidationError, match="Input should be a valid list"):
-                ClientConfig(
-                    client_name="test",
-                    sync_directory=temp_dir,
-                    ignore_patterns="*.tmp",  # type: ignore
-                )
-
-            # Empty pattern in list
-            with pytest.raises(
-                ValidationError, match="Ignore patterns cannot be empty"
-            ):
-                ClientConfig(
-                    client_name="test",
-                    sync_directory=temp_dir,
-                    ignore_patterns=["*.tmp", ""],
-                )
-
-    def test_client_config_validation_api_key(self):
+        with pytest.raises(ValidationError, match=msg):
+            _CC_VAL.validate_python(
+                {
+                    "client_name": "test",
+                    "sync_directory": str(shared_tmp),
+                    "ignore_patterns": patterns,
+                }
+            )
+
+    @pytest.mark.parametrize(
+        "api_key,msg",
+        [
+            ("short", _KEY_TOO_SHORT),
+            ("x" * 257, _KEY_TOO_LONG),
+        ],
+    )
+    def test_client_config_validation_api_key(self, shared_tmp, api_key, msg):
         """Test ClientConfig API key validation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Too short API key
-            with pytest.raises(ValidationError, match="API key too short"):
-                ClientConfig(
-                    client_name="test", sync_directory=temp_dir, api_key="short"
-                )
-
-            # Too long API key
-            with pytest.raises(ValidationError, match="API key too long"):
-                ClientConfig(
-                    client_name="test", sync_directory=temp_dir, api_key="x" * 257
-                )
-
-    def test_client_config_directory_creation(self):
+        with pytest.raises(ValidationError, match=msg):
+            _CC_VAL.validate_python(
+                {
+                    "client_name": "test",
+                    "sync_directory": str(shared_tmp),
+                    "api_key": api_key,
+                }
+            )
+
+    def test_client_config_directory_creation(self, sync_dir):
         """Test ClientConfig creates directory if it doesn't exist."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            new_dir = Path(temp_dir) / "new_client_dir"
+        new_dir = sync_dir / "new_client_dir"
 
-            config = ClientConfig(client_name="test", sync_directory=str(new_dir))
+        config = ClientConfig(client_name="test", sync_directory=str(new_dir))
 
-            assert Path(config.sync_directory).exists()
-            assert Path(config.sync_directory).is_dir()
+        _assert_is_dir(config.sync_directory)
 
 
 class TestModelSerialization:
     """Test model serialization/deserialization."""
 
-    def test_file_info_dict_conversion(self):
+    def test_file_info_dict_conversion(self, base_file_info):
         """Test FileInfo dict conversion."""
-        now = datetime.now()
-        file_info = FileInfo(
-            path="test.txt",
-            size=100,
-            checksum="hash",
-            modified_time=now,
-            is_directory=False,
-        )
-
         # Convert to dict
-        data = file_info.model_dump()
+        data = base_file_info.model_dump()
 
         assert data["path"] == "test.txt"
         assert data["size"] == 100
@@ -509,39 +510,28 @@ class TestModelSerialization:
 
         # Create from dict
         restored = FileInfo(**data)
-        assert restored == file_info
+        assert hash(restored) == hash(base_file_info)
+        assert restored == base_file_info
 
     def test_sync_request_json_conversion(self):
         """Test SyncRequest JSON conversion."""
-        files = [
-            FileInfo(
-                path="file1.txt",
-                size=100,
-                checksum="hash1",
-                modified_time=datetime.now(),
-            )
-        ]
-
-        request = SyncRequest(client_id="client123", files=files, sync_root="/sync")
+        request = SyncRequest(client_id="client123", files=_FILES, sync_root="/sync")
 
         # Convert to JSON
-        json_data = request.model_dump_json()
-        assert isinstance(json_data, str)
+        assert isinstance(request.model_dump_json(), str)
 
-        # Parse JSON
-        import json
-
-        parsed = json.loads(json_data)
+        # Inspect the JSON-compatible form
+        parsed = request.model_dump(mode="json")
         assert parsed["client_id"] == "client123"
-        assert len(parsed["files"]) == 1
+        assert len(parsed["files"]) == 2
+        assert parsed["files"][0]["modified_time"] == NOW.isoformat()
 
-    def test_config_validation_with_real_paths(self):
+    def test_config_validation_with_real_paths(self, sync_dir):
         """Test config validation with real file system paths."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Server config
-            server_config = ServerConfig(sync_directory=temp_dir)
-            assert Path(server_config.sync_directory).exists()
-
-            # Client config
-            client_config = ClientConfig(client_name="test", sync_directory=temp_dir)
-            assert Path(client_config.sync_directory).exists()
+        # Server config
+        server_config = ServerConfig(sync_directory=str(sync_dir))
+        _assert_is_dir(server_config.sync_directory)
+
+        # Client config
+        client_config = ClientConfig(client_name="test", sync_directory=str(sync_dir))
+        _assert_is_dir(client_config.sync_directory)
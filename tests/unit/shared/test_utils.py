@@ -1,15 +1,20 @@
 """Unit tests for shared utilities."""
 
 import hashlib
+import os
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from unittest.mock import Mock, patch
 
 import pytest
 
+import shared.utils as shared_utils
 from shared.utils import (
+    FileInfoBatch,
     _compile_pattern,
-    _compiled_patterns_cache,
+    _prepare_patterns,
     batch_get_file_info,
+    batch_get_file_info_columns,
     calculate_file_checksum,
     calculate_file_checksum_fast,
     calculate_file_checksum_sync,
@@ -62,6 +67,65 @@ class TestChecksumCalculation:
         expected = hashlib.sha256(content.encode()).hexdigest()
         assert checksum == expected
 
+    def test_calculate_file_checksum_sync_fadvise(self, temp_dir):
+        """Test the kernel read-ahead hint is optional and never fails hashing."""
+        test_file = temp_dir / "test.txt"
+        test_file.write_bytes(b"Hello, World!")
+        expected = hashlib.sha256(b"Hello, World!").hexdigest()
+
+        with patch("os.posix_fadvise", side_effect=OSError, create=True) as mock:
+            assert calculate_file_checksum_sync(str(test_file)) == expected
+        if hasattr(os, "POSIX_FADV_SEQUENTIAL"):
+            mock.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_calculate_file_checksum_fast_fadvise(self, temp_dir):
+        """Test the fast path gives the sequential-read hint on its read fd."""
+        pytest.importorskip("xxhash")
+        if not hasattr(os, "POSIX_FADV_SEQUENTIAL"):
+            pytest.skip("posix_fadvise is not available")
+        test_file = temp_dir / "test.txt"
+        test_file.write_bytes(b"Hello, World!")
+
+        with patch("os.posix_fadvise") as mock:
+            await calculate_file_checksum_fast(str(test_file))
+
+        mock.assert_called_once()
+        assert mock.call_args.args[1:] == (0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    def test_calculate_file_checksum_sync_empty_and_directory(self, temp_dir):
+        """Test synchronous checksum of an empty file and of a directory."""
+        empty_file = temp_dir / "empty.txt"
+        empty_file.touch()
+
+        assert calculate_file_checksum_sync(str(empty_file)) == (
+            hashlib.sha256(b"").hexdigest()
+        )
+        assert calculate_file_checksum_sync(str(temp_dir)) == ""
+
+    def test_calculate_file_checksum_sync_several_reads(self, temp_dir):
+        """Test files larger than chunk_size hash across several reads."""
+        test_file = temp_dir / "test.bin"
+        content = bytes(range(256)) * 10
+        test_file.write_bytes(content)
+
+        with patch("shared.utils.bytearray", wraps=bytearray) as buffer:
+            checksum = calculate_file_checksum_sync(str(test_file), chunk_size=100)
+
+        assert checksum == hashlib.sha256(content).hexdigest()
+        buffer.assert_called_once_with(100)
+
+    def test_calculate_file_checksum_sync_small_file_buffer(self, temp_dir):
+        """Test small files get a buffer sized to the file, not chunk_size."""
+        test_file = temp_dir / "small.txt"
+        test_file.write_bytes(b"hello")
+
+        with patch("shared.utils.bytearray", wraps=bytearray) as buffer:
+            checksum = calculate_file_checksum_sync(str(test_file))
+
+        assert checksum == hashlib.sha256(b"hello").hexdigest()
+        buffer.assert_called_once_with(6)
+
     @pytest.mark.asyncio
     async def test_calculate_file_checksum_fast_with_xxhash(self, temp_dir):
         """Test fast checksum with xxhash if available."""
@@ -75,7 +139,7 @@ class TestChecksumCalculation:
             mock_xxhash = Mock()
             mock_hasher = Mock()
             mock_hasher.hexdigest.return_value = "fast_hash_result"
-            mock_xxhash.xxh64.return_value = mock_hasher
+            mock_xxhash.xxh3_64.return_value = mock_hasher
 
             def side_effect(name, *args, **kwargs):
                 if name == "xxhash":
@@ -87,6 +151,19 @@ class TestChecksumCalculation:
             checksum = await calculate_file_checksum_fast(str(test_file))
             assert checksum == "fast_hash_result"
 
+    @pytest.mark.asyncio
+    async def test_calculate_file_checksum_fast_large_file(self, temp_dir):
+        """Test fast checksum of a file larger than one read buffer."""
+        xxhash = pytest.importorskip("xxhash")
+        test_file = temp_dir / "large.bin"
+        content = b"0123456789abcdef" * (128 * 1024)  # 2MB
+
+        with open(test_file, "wb") as f:
+            f.write(content)
+
+        checksum = await calculate_file_checksum_fast(str(test_file))
+        assert checksum == xxhash.xxh3_64(content).hexdigest()
+
     @pytest.mark.asyncio
     async def test_calculate_file_checksum_fast_fallback(self, temp_dir):
         """Test fast checksum fallback to SHA-256."""
@@ -141,6 +218,14 @@ class TestFileInfo:
         assert file_info["is_directory"] is True
         assert file_info["checksum"] == ""
 
+    def test_get_file_info_sync_directory_skips_hashing(self, temp_dir):
+        """Test directories never reach the checksum code path."""
+        with patch("shared.utils.calculate_file_checksum_sync") as mock_sync:
+            file_info = get_file_info_sync(str(temp_dir))
+
+        assert file_info["is_directory"] is True
+        mock_sync.assert_not_called()
+
     def test_get_file_info_sync_nonexistent(self):
         """Test file info for non-existent file."""
         file_info = get_file_info_sync("/non/existent/file.txt")
@@ -162,6 +247,21 @@ class TestFileInfo:
         assert file_info["size"] == len(content)
         assert file_info["is_directory"] is False
 
+    @pytest.mark.asyncio
+    async def test_get_file_info_sync_async_same_mtime(self, temp_dir):
+        """Test sync and async file info convert the same mtime identically."""
+        first = temp_dir / "first.txt"
+        second = temp_dir / "second.txt"
+        for path in (first, second):
+            path.write_text("x")
+            os.utime(path, (1_700_000_000.5, 1_700_000_000.5))
+
+        first_info = get_file_info_sync(str(first))
+        second_info = await get_file_info_async(str(second))
+
+        assert first_info["modified_time"] == datetime.fromtimestamp(1_700_000_000.5)
+        assert second_info["modified_time"] == first_info["modified_time"]
+
     @pytest.mark.asyncio
     async def test_get_file_info_async_fast_checksum(self, temp_dir):
         """Test async file info with fast checksum."""
@@ -198,6 +298,123 @@ class TestFileInfo:
             assert "path" in result
             assert "size" in result
 
+    @pytest.mark.asyncio
+    async def test_batch_get_file_info_mixed(self, temp_dir):
+        """Test batch file info with a directory and a missing path."""
+        test_file = temp_dir / "test.txt"
+        test_file.write_text("Hello, World!")
+        sub_dir = temp_dir / "subdir"
+        sub_dir.mkdir()
+
+        results = await batch_get_file_info(
+            [str(test_file), str(sub_dir), str(temp_dir / "missing.txt")]
+        )
+
+        assert results[0] == await get_file_info_async(str(test_file))
+        assert results[1]["is_directory"] is True
+        assert results[1]["checksum"] == ""
+        assert results[2] is None
+
+    @pytest.mark.asyncio
+    async def test_batch_get_file_info_pipelined_chunks(self, temp_dir):
+        """Test results stay in path order when stats arrive in several chunks."""
+        files = []
+        for i in range(7):
+            path = temp_dir / f"entry_{i}"
+            if i % 3 == 0:
+                path.mkdir()
+            else:
+                path.write_text("x" * i)
+            files.append(str(path))
+
+        with patch("shared.utils._STAT_CHUNK", 2):
+            results = await batch_get_file_info(files, max_workers=1)
+
+        for file_path, result in zip(files, results):
+            assert result == get_file_info_sync(file_path)
+
+    @pytest.mark.asyncio
+    async def test_batch_get_file_info_columns(self, temp_dir):
+        """Test column-wise batch results expose size and mtime columns."""
+        small = temp_dir / "small.txt"
+        small.write_text("a")
+        large = temp_dir / "large.txt"
+        large.write_text("a" * 100)
+        paths = [str(small), str(large), str(temp_dir / "missing.txt")]
+
+        results = await batch_get_file_info_columns(paths)
+
+        assert isinstance(results, FileInfoBatch)
+        assert len(results) == 3
+        assert list(results.sizes) == [1, 100, 0]
+        assert list(results.exists) == [1, 1, 0]
+        assert results.mtimes[1] == large.stat().st_mtime
+        assert [r["size"] for r in results if r is not None] == [1, 100]
+        assert results[1:] == [results[1], None]
+
+        rows = await batch_get_file_info(paths)
+        assert isinstance(rows, list)
+        assert rows == list(results)
+
+    @pytest.mark.asyncio
+    async def test_batch_get_file_info_fast_checksum_process_pool(self, temp_dir):
+        """Test large fast-checksum batches hashed in worker processes."""
+        files = []
+        for i in range(20):
+            test_file = temp_dir / f"test_{i}.txt"
+            test_file.write_text(f"Content {i}" * (i + 1))
+            files.append(str(test_file))
+        (temp_dir / "empty.txt").touch()
+        files.append(str(temp_dir / "empty.txt"))
+
+        results = await batch_get_file_info(
+            files, fast_checksum=True, use_processes=True
+        )
+
+        for file_path, result in zip(files, results):
+            assert result["checksum"] == await calculate_file_checksum_fast(file_path)
+
+    @pytest.mark.asyncio
+    async def test_batch_get_file_info_threads_by_default(self, temp_dir):
+        """Test large fast-checksum batches stay off the process pool by default."""
+        files = []
+        for i in range(20):
+            test_file = temp_dir / f"test_{i}.txt"
+            test_file.write_text(f"Content {i}")
+            files.append(str(test_file))
+
+        with patch("shared.utils._get_hash_process_pool") as get_pool:
+            results = await batch_get_file_info(files, fast_checksum=True)
+
+        get_pool.assert_not_called()
+        for file_path, result in zip(files, results):
+            assert result["checksum"] == await calculate_file_checksum_fast(file_path)
+
+    @pytest.mark.asyncio
+    async def test_batch_get_file_info_recovers_from_broken_pool(self, temp_dir):
+        """Test a dead hashing worker does not break later batches."""
+        files = []
+        for i in range(20):
+            test_file = temp_dir / f"test_{i}.txt"
+            test_file.write_text(f"Content {i}")
+            files.append(str(test_file))
+        expected = [await calculate_file_checksum_fast(path) for path in files]
+
+        broken_pool = shared_utils._get_hash_process_pool()
+        with pytest.raises(BrokenProcessPool):
+            broken_pool.submit(os._exit, 1).result()
+
+        results = await batch_get_file_info(
+            files, fast_checksum=True, use_processes=True
+        )
+        assert [result["checksum"] for result in results] == expected
+        assert shared_utils._hash_process_pool is not broken_pool
+
+        results = await batch_get_file_info(
+            files, fast_checksum=True, use_processes=True
+        )
+        assert [result["checksum"] for result in results] == expected
+
 
 class TestIgnorePatterns:
     """Test file ignore pattern functionality."""
@@ -220,10 +437,24 @@ class TestIgnorePatterns:
         assert should_ignore_file(".git/config", patterns) is True
         assert should_ignore_file("src/main.py", patterns) is False
 
+    def test_should_ignore_file_basename_or_full_path(self):
+        """Test patterns match the basename or the whole path, nothing between."""
+        patterns = ["*.tmp", "build/*", "cache"]
+
+        assert should_ignore_file("a/b/test.tmp", patterns) is True
+        assert should_ignore_file("src/cache", patterns) is True
+        assert should_ignore_file("src/cache/data.bin", patterns) is False
+        assert should_ignore_file("src/build/output.txt", patterns) is False
+        assert should_ignore_file("src/build", patterns) is False
+
+    def test_should_ignore_file_no_patterns(self):
+        """Test that an empty pattern list ignores nothing."""
+        assert should_ignore_file("anything.tmp", []) is False
+
     def test_compile_pattern_caching(self):
         """Test pattern compilation caching."""
         # Clear cache
-        _compiled_patterns_cache.clear()
+        _compile_pattern.cache_clear()
 
         pattern = "*.txt"
         compiled1 = _compile_pattern(pattern)
@@ -231,7 +462,14 @@ class TestIgnorePatterns:
 
         # Should be the same object (cached)
         assert compiled1 is compiled2
-        assert pattern in _compiled_patterns_cache
+        info = _compile_pattern.cache_info()
+        assert info.currsize == 1
+        assert info.hits == 1
+
+    def test_compile_pattern_cache_is_bounded(self):
+        """Test pattern caches have an upper size limit."""
+        assert _compile_pattern.cache_info().maxsize is not None
+        assert _prepare_patterns.cache_info().maxsize is not None
 
     def test_should_ignore_file_performance(self):
         """Test ignore performance with compiled patterns."""
@@ -252,8 +490,42 @@ class TestIgnorePatterns:
             for file_path in test_files:
                 should_ignore_file(file_path, patterns)
 
-        # Should not raise any errors and patterns should be cached
-        assert len(_compiled_patterns_cache) >= len(patterns)
+        # Should not raise any errors; wildcard patterns are compiled and
+        # cached, literal names are kept in a set instead
+        literals, glob_regex, _ = _prepare_patterns(tuple(patterns))
+        assert literals == {".git", "__pycache__"}
+        assert glob_regex is not None
+        assert _compile_pattern.cache_info().currsize >= 3
+
+    def test_should_ignore_file_literal_patterns(self):
+        """Test literal-only pattern lists need no regex."""
+        patterns = [".git", "node_modules"]
+
+        assert _prepare_patterns(tuple(patterns))[1] is None
+        assert should_ignore_file("repo/.git", patterns) is True
+        assert should_ignore_file("node_modules", patterns) is True
+        assert should_ignore_file("repo/.github", patterns) is False
+
+    def test_should_ignore_file_hyperscan_matches_regex(self):
+        """Test the hyperscan matcher agrees with the combined regex."""
+        pytest.importorskip("hyperscan")
+        patterns = [f"*.ext{i}" for i in range(20)] + ["build/*", "a*b*c", "[!x]?.z"]
+        _, glob_regex, glob_scanner = _prepare_patterns(tuple(patterns))
+        assert glob_scanner is not None
+
+        for file_path in [
+            "src/main.py",
+            "src/main.ext7",
+            "build/out.o",
+            "src/build/out.o",
+            "aXbYc",
+            "dir/ab.z",
+            "dir/xb.z",
+            "",
+        ]:
+            expected = glob_regex.match(file_path) is not None
+            assert glob_scanner.match(file_path) is expected
+            assert should_ignore_file(file_path, patterns) is expected
 
 
 class TestPathUtilities:
@@ -265,6 +537,15 @@ class TestPathUtilities:
         assert normalize_path("path\\to\\file.txt") == "path/to/file.txt"
         assert normalize_path("./path/to/file.txt") == "path/to/file.txt"
 
+    def test_normalize_path_cleans_like_pathlib(self):
+        """Test redundant separators and "." components are still collapsed."""
+        assert normalize_path("path//to/./file.txt") == "path/to/file.txt"
+        assert normalize_path("path/to/dir/") == "path/to/dir"
+        assert normalize_path("") == "."
+        assert normalize_path("../.hidden") == "../.hidden"
+        assert normalize_path("dir\n/") == "dir\n"
+        assert normalize_path("a\n/b/") == "a\n/b"
+
     def test_normalize_path_windows(self):
         """Test path normalization for Windows-style paths."""
         with patch("shared.utils.Path") as mock_path:
@@ -290,6 +571,10 @@ class TestPathUtilities:
         result = get_relative_path(file_path, base)
         assert result == file_path  # Should return original path
 
+    def test_get_relative_path_newline_in_name(self):
+        """Test a trailing slash after a newline is still cleaned."""
+        assert get_relative_path("/base/line\n/", "/base") == "line\n"
+
 
 class TestDirectoryOperations:
     """Test directory operation utilities."""
@@ -382,21 +667,40 @@ class TestFileCopy:
         assert dst_file.exists()
         assert dst_file.stat().st_size == src_file.stat().st_size
 
+    @pytest.mark.asyncio
+    async def test_copy_file_async_without_kernel_copy(self, temp_dir):
+        """Test async copying falls back to a buffered copy."""
+        src_file = temp_dir / "source.bin"
+        dst_file = temp_dir / "destination.bin"
+        content = bytes(range(256)) * 1024
+
+        with open(src_file, "wb") as f:
+            f.write(content)
+
+        with patch("shared.utils._KERNEL_COPY_FUNCS", ()):
+            await copy_file_async(str(src_file), str(dst_file), chunk_size=4096)
+
+        assert dst_file.read_bytes() == content
+
 
 class TestErrorHandling:
     """Test error handling in utilities."""
 
     @pytest.mark.asyncio
-    async def test_calculate_checksum_permission_error(self):
+    async def test_calculate_checksum_permission_error(self, temp_dir):
         """Test checksum calculation with permission error."""
-        with patch("aiofiles.open", side_effect=PermissionError):
-            checksum = await calculate_file_checksum("/protected/file.txt")
+        test_file = temp_dir / "protected.txt"
+        test_file.write_text("secret")
+
+        with patch("shared.utils.open", side_effect=PermissionError):
+            checksum = await calculate_file_checksum(str(test_file))
             assert checksum == ""
+            assert await calculate_file_checksum_fast(str(test_file)) == ""
 
     @pytest.mark.asyncio
     async def test_get_file_info_os_error(self):
         """Test file info with OS error."""
-        with patch("pathlib.Path.stat", side_effect=OSError):
+        with patch("os.stat", side_effect=OSError):
             file_info = await get_file_info_async("/some/file.txt")
             assert file_info is None
 